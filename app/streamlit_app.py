@@ -8,18 +8,29 @@ Delivers actionable insights for strategic player evaluation and recruitment.
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 from pathlib import Path
 from datetime import datetime
+import os
 import sys
-import io
+import threading
+import base64
+import hmac
 from io import BytesIO
+from typing import NamedTuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# st.plotly_chart serializes every figure with plotly.io.to_json on each rerun;
+# orjson handles the numpy arrays natively instead of the stdlib json encoder
+pio.json.config.default_engine = 'orjson'
+
 # ===========================================
 # PAGE CONFIGURATION
 # ===========================================
@@ -53,10 +64,30 @@ CFG_COLORS = {
     'grid': '#E8ECF0'          # Grid color
 }
 
+# Plotly layout settings shared by every chart, merged into each figure's layout
+BASE_LAYOUT = dict(
+    plot_bgcolor='white',
+    paper_bgcolor='white',
+    font=dict(color=CFG_COLORS['text'], size=12)
+)
+
+# Grid and zero-line styling shared by the value axes, merged into each axis dict.
+# Kept as explicit layout keys rather than a pio template: the "streamlit" chart
+# theme rewrites template-level axis colours in the browser.
+AXIS_STYLE = dict(
+    gridcolor=CFG_COLORS['grid'],
+    showgrid=True,
+    zeroline=True,
+    zerolinecolor=CFG_COLORS['border']
+)
+
 # ===========================================
 # CUSTOM CSS - PROFESSIONAL WHITE DESIGN
 # ===========================================
-st.markdown(f"""
+@st.cache_resource
+def professional_css() -> str:
+    """Build the global stylesheet once per server process (the palette is constant)."""
+    return f"""
 <style>
     /* Main background - WHITE */
     .main {{
@@ -169,39 +200,129 @@ st.markdown(f"""
         color: {CFG_COLORS['text']} !important;
     }}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+# The markup still has to be emitted on every run, since Streamlit drops elements
+# that a rerun does not redraw; only the templating is cached
+st.markdown(professional_css(), unsafe_allow_html=True)
 
 
 # ===========================================
 # DATA LOADING
 # ===========================================
+# Report columns parsed as timestamps while reading the CSV
+DATE_COLUMNS = ['ReportCreatedOn', 'ReportModifiedOn', 'MatchDate']
+
+# String columns stored as pandas categoricals after loading
+CATEGORICAL_COLUMNS = [
+    'ReportPrimaryPosition', 'AgeBand', 'Country', 'CurrentTeam',
+    'ReportFoot', 'ReportType', 'PotentialGrade'
+]
+
+# Other low-cardinality groupby keys, also stored as categoricals (not sidebar filters)
+GROUP_KEY_COLUMNS = ['ScoutID']
+
+# Low-cardinality report columns no chart reads; encoded too, so filter copies and the
+# cached frame carry small codes instead of Python strings
+PASSTHROUGH_CATEGORICAL_COLUMNS = [
+    'ReportTemplate', 'ReportGame', 'Result', 'ReportSecondaryPosition',
+    'ReportFormation', 'PlayerFirstNationality', 'Competition'
+]
+
+# High-cardinality player keys (nunique / groupby targets), stored as Arrow-backed strings
+ARROW_STRING_COLUMNS = ['PlayerID', 'PlayerName']
+
+
+def _write_parquet_snapshot(df: pd.DataFrame, path: Path):
+    """Write df to path via a temp file in the same directory, so readers never see a partial file."""
+    # Process and thread id keep concurrent writers (several server processes) apart
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd')
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 @st.cache_data
 def load_data():
-    """Load cleaned datasets with caching."""
+    """Load cleaned datasets with caching.
+
+    The merged result is snapshotted to Parquet next to the processed CSVs so
+    cold starts skip CSV tokenization and date parsing while the CSVs are unchanged.
+    The sidebar filter options are built here as well so they are cached with the data.
+    """
     BASE_DIR = Path(__file__).parent.parent
     reporting_path = BASE_DIR / "data" / "processed" / "reporting_cleaned.csv"
     players_path = BASE_DIR / "data" / "processed" / "players_cleaned.csv"
-    
+    merged_cache_path = BASE_DIR / "data" / "processed" / "_merged.parquet"
+    players_cache_path = BASE_DIR / "data" / "processed" / "_players.parquet"
+
     try:
-        df_reporting = pd.read_csv(reporting_path)
+        # Reuse the Parquet snapshot only if it is newer than both cleaned CSVs
+        # and this module (so changes to the parsing below also invalidate it)
+        source_mtime = max(
+            reporting_path.stat().st_mtime,
+            players_path.stat().st_mtime,
+            Path(__file__).stat().st_mtime
+        )
+        if (merged_cache_path.exists() and players_cache_path.exists() and
+                min(merged_cache_path.stat().st_mtime, players_cache_path.stat().st_mtime) > source_mtime):
+            try:
+                df_merged = pd.read_parquet(merged_cache_path, engine='pyarrow')
+                df_players = pd.read_parquet(players_cache_path, engine='pyarrow')
+            except (OSError, pa.ArrowInvalid):
+                pass  # Unreadable or truncated snapshot: rebuild it from the CSVs below
+            else:
+                # The Parquet metadata only records "string", which reads back Python-backed;
+                # restore the Arrow storage the player columns were written with
+                df_merged[ARROW_STRING_COLUMNS] = df_merged[ARROW_STRING_COLUMNS].astype('string[pyarrow]')
+                return df_merged, df_players, build_filter_options(df_merged)
+
+        # Read reports with Arrow's multithreaded CSV reader; date columns are parsed
+        # during the read, trying the timestamped format before the date-only one
+        df_reporting = pacsv.read_csv(
+            reporting_path,
+            convert_options=pacsv.ConvertOptions(
+                column_types={col: pa.timestamp('ns') for col in DATE_COLUMNS},
+                timestamp_parsers=['%d/%m/%Y %H:%M', '%d/%m/%Y'],
+                strings_can_be_null=True
+            )
+        ).to_pandas()
         df_players = pd.read_csv(players_path)
         
-        # Parse dates
-        date_cols = ['ReportCreatedOn', 'ReportModifiedOn', 'MatchDate']
-        for col in date_cols:
-            if col in df_reporting.columns:
-                df_reporting[col] = pd.to_datetime(df_reporting[col], format='%d/%m/%Y %H:%M', errors='coerce')
-                if df_reporting[col].isna().all():
-                    df_reporting[col] = pd.to_datetime(df_reporting[col], format='%d/%m/%Y', errors='coerce')
-        
-        # Merge with players data to get CurrentTeam
-        df_merged = df_reporting.merge(
-            df_players[['PlayerID', 'DateOfBirth', 'CurrentTeam']],
-            on='PlayerID',
-            how='left'
+        # Look up CurrentTeam from the players table (the only player column the
+        # dashboard uses), instead of merging extra columns onto every report
+        df_merged = df_reporting
+        df_merged['CurrentTeam'] = df_merged['PlayerID'].map(
+            df_players.set_index('PlayerID')['CurrentTeam']
         )
-        
-        return df_merged, df_players
+
+        # Dictionary-encode low-cardinality filter columns (categories come out sorted)
+        # and store the whole-number grades as nullable Int8, so filter masks and unique
+        # scans work on small codes (PotentialGrade is one of the categoricals)
+        for col in CATEGORICAL_COLUMNS + GROUP_KEY_COLUMNS + PASSTHROUGH_CATEGORICAL_COLUMNS:
+            if col in df_merged.columns:
+                df_merged[col] = df_merged[col].astype('category')
+        df_merged['PerformanceGrade'] = df_merged['PerformanceGrade'].astype('Int8')
+        # Player ids/names are too many distinct values for categoricals; Arrow strings
+        # let nunique/groupby hash them with pyarrow's dictionary_encode kernel
+        for col in ARROW_STRING_COLUMNS:
+            df_merged[col] = df_merged[col].astype('string[pyarrow]')
+
+        # Keep reports in MatchDate order so the sidebar date range is a slice
+        df_merged = df_merged.sort_values('MatchDate', kind='mergesort', na_position='last').reset_index(drop=True)
+
+        # Write the Parquet snapshot (a read-only deployment simply keeps parsing CSVs)
+        try:
+            _write_parquet_snapshot(df_merged, merged_cache_path)
+            _write_parquet_snapshot(df_players, players_cache_path)
+        except OSError:
+            pass
+
+        return df_merged, df_players, build_filter_options(df_merged)
     except FileNotFoundError as e:
         st.error(f"Data files not found. Please run the cleaning pipeline first: {e}")
         st.stop()
@@ -210,25 +331,207 @@ def load_data():
 # ===========================================
 # HELPER FUNCTIONS
 # ===========================================
-def get_performance_color(value: float, min_val: float = 1.0, max_val: float = 5.0) -> str:
-    """Get color from CFG palette based on performance value - consistent mapping."""
-    if pd.isna(value):
-        return CFG_COLORS['light_gray']
-    
-    # Normalize value to 0-1 range
-    normalized = (value - min_val) / (max_val - min_val)
-    normalized = max(0, min(1, normalized))  # Clamp between 0 and 1
-    
-    # Consistent color mapping: Low (red) < 2.5, Medium (orange) 2.5-3.5, High (teal) 3.5-4.5, Elite (blue) > 4.5
-    # Using normalized: < 0.375 (Low), 0.375-0.625 (Medium), 0.625-0.875 (High), > 0.875 (Elite)
-    if normalized < 0.375:
-        return CFG_COLORS['danger']  # Low - Red
-    elif normalized < 0.625:
-        return CFG_COLORS['warning']  # Medium - Orange
-    elif normalized < 0.875:
-        return CFG_COLORS['success']  # High - Teal
-    else:
-        return CFG_COLORS['primary']  # Elite - Blue
+def sorted_unique(values: pd.Series) -> list:
+    """Sorted distinct non-null values of a column, using Arrow's compute kernels."""
+    uniques = pc.unique(pa.array(values, from_pandas=True).drop_null())
+    return pc.take(uniques, pc.array_sort_indices(uniques)).to_pylist()
+
+
+def build_filter_options(df: pd.DataFrame) -> dict:
+    """Build the sorted sidebar option lists once per loaded dataset."""
+    filter_options = {}
+    for col in CATEGORICAL_COLUMNS:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Categories are already the sorted distinct values; no scan needed
+            filter_options[col] = ['All'] + values.cat.categories.tolist()
+        else:
+            filter_options[col] = ['All'] + sorted_unique(values)
+    filter_options['PerformanceGrade'] = ['All'] + [str(g) for g in sorted_unique(df['PerformanceGrade'])]
+    return filter_options
+
+
+def group_mode(df: pd.DataFrame, keys: list, col: str) -> pd.Series:
+    """Most frequent value of a column per group, vectorized (ties -> smallest value, like Series.mode()[0])."""
+    grouped = df.groupby(keys, observed=True)
+    group_ids = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)  # -1: rows with a missing key
+    values = df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype('category')
+    categories = np.asarray(values.cat.categories, dtype=object)
+    value_codes = values.cat.codes.to_numpy()
+    
+    # Count every (group, value) pair into a groups x categories matrix in one bincount;
+    # argmax then picks the first (smallest, as categories are sorted) of any tied values
+    valid = (group_ids >= 0) & (value_codes >= 0)
+    n_groups, n_categories = grouped.ngroups, len(categories)
+    counts = np.bincount(
+        group_ids[valid] * n_categories + value_codes[valid],
+        minlength=n_groups * n_categories
+    ).reshape(n_groups, n_categories)
+    has_value = counts.max(axis=1, initial=0) > 0
+    modes = np.full(n_groups, None, dtype=object)
+    if has_value.any():
+        modes[has_value] = categories[counts[has_value].argmax(axis=1)]
+    return pd.Series(modes, index=grouped.size().index, dtype=object)
+
+@st.cache_data(show_spinner=False)
+def build_player_stats(df: pd.DataFrame, player_keys: tuple) -> pd.DataFrame:
+    """Per-player mean performance, most common potential grade and report count.
+
+    Cached on the frame's content, so charts and tab reruns that aggregate the
+    same filtered data at the same granularity share one groupby.
+    """
+    player_keys = list(player_keys)
+    player_stats = df.groupby(player_keys, observed=True, sort=False).agg({
+        'PerformanceGrade': 'mean',
+        'ReportID': 'count'
+    })
+    player_stats.insert(1, 'PotentialGrade', group_mode(df, player_keys, 'PotentialGrade').reindex(player_stats.index).fillna('N/A'))
+    return player_stats.reset_index()
+
+
+def unique_players_per_group(df: pd.DataFrame, key: str) -> pd.Series:
+    """PlayerID nunique per value of a categorical key, like groupby(key, observed=True, sort=False).
+
+    Each (group, player) pair is packed into one integer, deduplicated with one hash
+    pass (pd.unique) and counted per group with bincount, instead of a set per group.
+    """
+    group_codes = df[key].cat.codes.to_numpy().astype(np.int64)
+    player_codes = pd.factorize(df['PlayerID'])[0].astype(np.int64)
+    valid = (group_codes >= 0) & (player_codes >= 0)
+    n_players = int(player_codes.max()) + 1 if valid.any() else 1
+    pairs = pd.unique(group_codes[valid] * n_players + player_codes[valid])
+    counts = np.bincount(pairs // n_players, minlength=len(df[key].cat.categories))
+    seen = pd.unique(group_codes[group_codes >= 0])  # groups in order of first appearance
+    return pd.Series(counts[seen], index=pd.CategoricalIndex(
+        df[key].cat.categories[seen], categories=df[key].cat.categories, name=key
+    ), name='PlayerID')
+
+def group_grade_stats(df: pd.DataFrame, key: str, min_players: int) -> pd.DataFrame:
+    """Mean performance and unique players per group, for groups with at least min_players players.
+
+    Both come straight from the key's categorical codes: the mean is a bincount of
+    grade sums over grade counts, so no groupby or filtered copy of the frame is built.
+    """
+    unique_players = unique_players_per_group(df, key)
+    unique_players = unique_players[unique_players >= min_players]
+    group_codes = df[key].cat.codes.to_numpy()
+    grades = df['PerformanceGrade'].to_numpy(dtype=float, na_value=np.nan)
+    graded = (group_codes >= 0) & ~np.isnan(grades)
+    n_groups = len(df[key].cat.categories)
+    grade_sums = np.bincount(group_codes[graded], weights=grades[graded], minlength=n_groups)
+    grade_counts = np.bincount(group_codes[graded], minlength=n_groups)
+    kept = unique_players.index.codes
+    grade_stats = unique_players.to_frame('UniquePlayers')
+    grade_stats.insert(0, 'AvgPerformance', np.divide(
+        grade_sums[kept], grade_counts[kept], out=np.full(len(kept), np.nan), where=grade_counts[kept] > 0
+    ))
+    return grade_stats
+
+@st.cache_data(show_spinner=False)
+def build_team_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-team mean performance, unique players and Potential A players, for named teams with 3+ players.
+
+    Cached on the frame's content so every team chart in a rerun shares one aggregation.
+    Works on the CurrentTeam codes of the whole frame (missing teams have no code), so
+    only the blank-name group is dropped afterwards instead of copying the named rows.
+    """
+    team_stats = group_grade_stats(df, 'CurrentTeam', 3)
+    team_stats = team_stats[team_stats.index != '']
+    high_pot_count = unique_players_per_group(df[df['PotentialGrade'] == 'A'], 'CurrentTeam')
+    team_stats['HighPotentialCount'] = high_pot_count.reindex(team_stats.index, fill_value=0)
+    team_stats['HighPotentialPct'] = team_stats['HighPotentialCount'] / team_stats['UniquePlayers'] * 100
+    return team_stats.rename_axis('Team').reset_index()
+
+@st.cache_data(show_spinner=False)
+def build_country_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-country mean performance, scouted players and % of Potential A players, best countries first.
+
+    Cached on the frame's content, so tab widget reruns reuse the table instead of re-slicing per country.
+    """
+    country_stats = group_grade_stats(df, 'Country', 0)
+    high_pot_count = unique_players_per_group(df[df['PotentialGrade'] == 'A'], 'Country')
+    high_pot_count = high_pot_count.reindex(country_stats.index, fill_value=0)
+    country_stats = pd.DataFrame({
+        'Avg Performance': country_stats['AvgPerformance'].round(2),
+        'Scouted Players': country_stats['UniquePlayers'],
+        '% High Potential': (high_pot_count / country_stats['UniquePlayers'] * 100).fillna(0).round(2)
+    })
+    return country_stats.rename_axis('Country').reset_index().sort_values('Avg Performance', ascending=False)
+
+class MonthlyStats(NamedTuple):
+    """Per-month aggregates as parallel arrays, one entry per month in date order."""
+    month: np.ndarray
+    performance: np.ndarray
+    unique_players: np.ndarray
+    reports: np.ndarray
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_monthly_stats(df: pd.DataFrame) -> MonthlyStats:
+    """Per-month mean performance, unique players and report count for dated reports.
+
+    Cached on the frame's content so reruns with unchanged filters only rebuild the trend figures.
+    A resource cache hands back the same read-only arrays instead of unpickling a copy per hit.
+    """
+    # Only the four columns the aggregation reads; .loc already returns a new frame
+    df_with_date = df.loc[df['MatchDate'].notna(), ['MatchDate', 'PerformanceGrade', 'PlayerID', 'ReportID']]
+    # Integer month key (year * 12 + month - 1) so the groupby runs on int64 instead of Periods
+    match_dates = df_with_date['MatchDate'].dt
+    month_key = match_dates.year.to_numpy(dtype=np.int64) * 12 + match_dates.month.to_numpy(dtype=np.int64) - 1
+    
+    # One set of month codes feeds all three aggregates: bincount sums and counts per
+    # month, and PlayerID nunique from deduplicated (month, player) pairs
+    month_codes, month_keys = pd.factorize(month_key, sort=True)
+    n_months = len(month_keys)
+    grades = df_with_date['PerformanceGrade'].to_numpy(dtype=float, na_value=np.nan)
+    has_grade = ~np.isnan(grades)
+    grade_sums = np.bincount(month_codes[has_grade], weights=grades[has_grade], minlength=n_months)
+    grade_counts = np.bincount(month_codes[has_grade], minlength=n_months)
+    player_codes = pd.factorize(df_with_date['PlayerID'])[0]
+    has_player = player_codes >= 0
+    n_players = int(player_codes.max()) + 1 if has_player.any() else 1
+    player_pairs = np.unique(month_codes[has_player] * n_players + player_codes[has_player])
+    
+    # Plain arrays rather than a DataFrame: the trend figure hands them straight to the traces
+    return MonthlyStats(
+        month=np.array([f"{key // 12:04d}-{key % 12 + 1:02d}" for key in month_keys], dtype=object),
+        performance=np.divide(grade_sums, grade_counts, out=np.full(n_months, np.nan), where=grade_counts > 0),
+        unique_players=np.bincount(player_pairs // n_players, minlength=n_months),
+        reports=np.bincount(month_codes[df_with_date['ReportID'].notna().to_numpy()], minlength=n_months)
+    )
+
+
+# Lookup table for the performance colours: band edges on the normalized 1-5 scale,
+# Low (red) < 2.5, Medium (orange) 2.5-3.5, High (teal) 3.5-4.5, Elite (blue) > 4.5,
+# and the palette entry for each band, plus light gray for NaN
+PERFORMANCE_THRESHOLDS = np.array([0.375, 0.625, 0.875])
+PERFORMANCE_PALETTE = np.array([
+    CFG_COLORS['danger'], CFG_COLORS['warning'], CFG_COLORS['success'], CFG_COLORS['primary'],
+    CFG_COLORS['light_gray']
+], dtype=object)
+
+def get_performance_colors(values, min_val: float = 1.0, max_val: float = 5.0) -> np.ndarray:
+    """Get colors from CFG palette for a whole column of performance values - consistent mapping."""
+    values = np.asarray(values, dtype=float)
+    normalized = np.clip((values - min_val) / (max_val - min_val), 0, 1)
+    
+    # Band index per value (0-3), with NaN sent to the light gray slot, then one gather
+    band = np.digitize(normalized, PERFORMANCE_THRESHOLDS)
+    band[np.isnan(values)] = len(PERFORMANCE_THRESHOLDS) + 1
+    return PERFORMANCE_PALETTE[band]
+
+def get_quartile_colors(normalized) -> np.ndarray:
+    """Map values already normalized to 0-1 onto the Low/Medium/High/Elite palette in quarter bands."""
+    normalized = np.asarray(normalized, dtype=float)
+    return np.select(
+        [normalized < 0.25, normalized < 0.5, normalized < 0.75],
+        [CFG_COLORS['danger'], CFG_COLORS['warning'], CFG_COLORS['success']],  # Low, Medium, High
+        default=CFG_COLORS['primary']  # Elite
+    )
+
+def hover_columns(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """Stack columns into one Unicode array for hover customdata (no mixed object frame copy)."""
+    return np.stack([df[col].astype(str).to_numpy(dtype=str) for col in columns], axis=1)
 
 def render_performance_color_legend():
     """Render legend explaining performance color coding for bar charts."""
@@ -242,41 +545,50 @@ def render_performance_color_legend():
     """, unsafe_allow_html=True)
 
 
-def download_excel(df: pd.DataFrame, filename: str = "scouting_data.xlsx"):
-    """Convert DataFrame to Excel and return download button."""
+@st.cache_data(show_spinner=False)
+def _to_xlsx_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to Excel bytes, cached on the frame's content."""
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
         df.to_excel(writer, index=False, sheet_name='Data')
-    output.seek(0)
+    return output.getvalue()
+
+def download_excel(df: pd.DataFrame, filename: str = "scouting_data.xlsx"):
+    """Convert DataFrame to Excel and return download button."""
     return st.download_button(
         label="Download as Excel",
-        data=output.getvalue(),
+        data=_to_xlsx_bytes(df),
         file_name=filename,
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
+# Navigation callbacks: used as on_click handlers, they run before the rerun the
+# click already triggers, so no extra st.rerun() is needed
 def navigate_to_tab(tab_id: str):
     """Navigate reliably to a dashboard tab using session state and query params."""
     st.session_state['current_page'] = 'dashboard'
     st.session_state['selected_tab'] = tab_id
     st.query_params.update(page='dashboard', tab=tab_id)
-    st.rerun()
+
+def go_home():
+    """Return to the homepage."""
+    st.session_state['current_page'] = 'home'
+    st.query_params.clear()
+
+def logout():
+    """End the session and return to the login page."""
+    st.session_state['authenticated'] = False
+    st.session_state['current_page'] = 'login'
+    st.query_params.clear()
 
 
 # ===========================================
-def create_filters_sidebar(df: pd.DataFrame):
+def create_filters_sidebar(df: pd.DataFrame, filter_options: dict):
     """Create professional filters in sidebar with session controls first."""
     # Session controls first
     st.sidebar.markdown("### **SESSION**")
-    if st.sidebar.button("**Home**", use_container_width=True, key='home_button'):
-        st.session_state['current_page'] = 'home'
-        st.query_params.clear()
-        st.rerun()
-    if st.sidebar.button("**Logout**", use_container_width=True, key='logout_button'):
-        st.session_state['authenticated'] = False
-        st.session_state['current_page'] = 'login'
-        st.query_params.clear()
-        st.rerun()
+    st.sidebar.button("**Home**", use_container_width=True, key='home_button', on_click=go_home)
+    st.sidebar.button("**Logout**", use_container_width=True, key='logout_button', on_click=logout)
     
     st.sidebar.markdown("---")
     st.sidebar.markdown("### **ANALYSIS FILTERS**")
@@ -285,35 +597,35 @@ def create_filters_sidebar(df: pd.DataFrame):
     top_n = st.sidebar.number_input("**Top N Results**", min_value=5, max_value=100, value=10, step=5, key='top_n_filter')
     
     # Position filter
-    positions = ['All'] + sorted(df['ReportPrimaryPosition'].dropna().unique().tolist())
+    positions = filter_options['ReportPrimaryPosition']
     selected_position = st.sidebar.selectbox("**Primary Position**", positions, key='pos_filter')
     
     # Age band filter
-    age_bands = ['All'] + sorted(df['AgeBand'].dropna().unique().tolist())
+    age_bands = filter_options['AgeBand']
     selected_age = st.sidebar.selectbox("**Age Band**", age_bands, key='age_filter')
     
     # Country filter
-    countries = ['All'] + sorted(df['Country'].dropna().unique().tolist())
+    countries = filter_options['Country']
     selected_country = st.sidebar.selectbox("**Country**", countries, key='country_filter')
     
     # Team filter (from CurrentTeam)
-    teams = ['All'] + sorted(df['CurrentTeam'].dropna().unique().tolist())
+    teams = filter_options['CurrentTeam']
     selected_team = st.sidebar.selectbox("**Current Team**", teams, key='team_filter')
     
     # Foot filter
-    feet = ['All'] + sorted(df['ReportFoot'].dropna().unique().tolist())
+    feet = filter_options['ReportFoot']
     selected_foot = st.sidebar.selectbox("**Preferred Foot**", feet, key='foot_filter')
     
     # Report type filter
-    report_types = ['All'] + sorted(df['ReportType'].dropna().unique().tolist())
+    report_types = filter_options['ReportType']
     selected_report_type = st.sidebar.selectbox("**Report Type**", report_types, key='report_filter')
     
     # Performance grade filter
-    grades = ['All'] + sorted([str(int(g)) for g in df['PerformanceGrade'].dropna().unique()])
+    grades = filter_options['PerformanceGrade']
     selected_grade = st.sidebar.selectbox("**Performance Grade**", grades, key='perf_filter')
     
     # Potential grade filter
-    pot_grades = ['All'] + sorted(df['PotentialGrade'].dropna().unique().tolist())
+    pot_grades = filter_options['PotentialGrade']
     selected_pot_grade = st.sidebar.selectbox("**Potential Grade**", pot_grades, key='pot_filter')
     
     # Date range filter
@@ -330,38 +642,35 @@ def create_filters_sidebar(df: pd.DataFrame):
     else:
         date_range = None
     
-    # Apply filters
-    df_filtered = df.copy()
-    
-    if selected_position != 'All':
-        df_filtered = df_filtered[df_filtered['ReportPrimaryPosition'] == selected_position]
-    
-    if selected_age != 'All':
-        df_filtered = df_filtered[df_filtered['AgeBand'] == selected_age]
-    
-    if selected_country != 'All':
-        df_filtered = df_filtered[df_filtered['Country'] == selected_country]
-    
-    if selected_team != 'All':
-        df_filtered = df_filtered[df_filtered['CurrentTeam'] == selected_team]
-    
-    if selected_foot != 'All':
-        df_filtered = df_filtered[df_filtered['ReportFoot'] == selected_foot]
-    
-    if selected_report_type != 'All':
-        df_filtered = df_filtered[df_filtered['ReportType'] == selected_report_type]
+    # Apply filters as one combined boolean mask, then index the frame once.
+    # Boolean indexing already returns a new frame, so no upfront copy is needed.
+    equality_filters = [
+        ('ReportPrimaryPosition', selected_position),
+        ('AgeBand', selected_age),
+        ('Country', selected_country),
+        ('CurrentTeam', selected_team),
+        ('ReportFoot', selected_foot),
+        ('ReportType', selected_report_type),
+        ('PotentialGrade', selected_pot_grade),
+    ]
+    mask = np.ones(len(df), dtype=bool)
+    for col, selected_value in equality_filters:
+        if selected_value != 'All':
+            mask &= (df[col] == selected_value).to_numpy()
     
     if selected_grade != 'All':
-        df_filtered = df_filtered[df_filtered['PerformanceGrade'] == float(selected_grade)]
-    
-    if selected_pot_grade != 'All':
-        df_filtered = df_filtered[df_filtered['PotentialGrade'] == selected_pot_grade]
+        mask &= (df['PerformanceGrade'] == int(selected_grade)).to_numpy(dtype=bool, na_value=False)
     
     if date_range and len(date_range) == 2:
-        df_filtered = df_filtered[
-            (df_filtered['MatchDate'] >= pd.Timestamp(date_range[0])) &
-            (df_filtered['MatchDate'] <= pd.Timestamp(date_range[1]))
-        ]
+        # load_data() sorts reports by MatchDate (missing dates last), so the range
+        # is a contiguous slice found with two binary searches
+        match_dates = df['MatchDate'].to_numpy()
+        start = match_dates.searchsorted(np.datetime64(pd.Timestamp(date_range[0])), side='left')
+        end = match_dates.searchsorted(np.datetime64(pd.Timestamp(date_range[1])), side='right')
+        mask[:start] = False
+        mask[end:] = False
+    
+    df_filtered = df[mask]
     
     return df_filtered, top_n
 
@@ -369,16 +678,25 @@ def create_filters_sidebar(df: pd.DataFrame):
 # ===========================================
 # KPI DISPLAY - PROFESSIONAL DESIGN
 # ===========================================
+def _count_distinct_codes(codes: np.ndarray, mask: np.ndarray, n_codes: int) -> int:
+    """Count distinct factorized codes among the rows selected by mask."""
+    seen = np.zeros(n_codes, dtype=bool)
+    seen[codes[mask & (codes >= 0)]] = True  # -1: missing ids, skipped like nunique()
+    return int(seen.sum())
+
 def display_kpis(df: pd.DataFrame):
     """Display professional KPI cards with correct calculations in single row layout."""
     total_reports = len(df)
-    unique_players = df['PlayerID'].nunique()
+    # Hash PlayerID to integer codes once; the distinct counts below are then
+    # plain array scatters instead of a hash-set build per subset
+    player_codes, player_uniques = pd.factorize(df['PlayerID'])
+    performance = df['PerformanceGrade'].to_numpy(dtype=float, na_value=np.nan)
+    unique_players = len(player_uniques)
     avg_performance = df['PerformanceGrade'].mean()
-    high_potential = df[df['PotentialGrade'] == 'A']['PlayerID'].nunique()
-    total_players = df['PlayerID'].nunique()
-    high_pot_pct = (high_potential / total_players * 100) if total_players > 0 else 0
-    top_performers = df[df['PerformanceGrade'] >= 4]['PlayerID'].nunique()
-    top_perf_pct = (top_performers / total_players * 100) if total_players > 0 else 0
+    high_potential = _count_distinct_codes(player_codes, (df['PotentialGrade'] == 'A').to_numpy(), unique_players)
+    high_pot_pct = (high_potential / unique_players * 100) if unique_players > 0 else 0
+    top_performers = _count_distinct_codes(player_codes, performance >= 4, unique_players)
+    top_perf_pct = (top_performers / unique_players * 100) if unique_players > 0 else 0
     
     # Single row: 5 KPIs
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -401,62 +719,52 @@ def display_kpis(df: pd.DataFrame):
 def plot_top_players_ranking(df: pd.DataFrame, top_n: int = 20):
     """Plot top players by average performance with professional design."""
     # Calculate average performance per player
-    player_stats = df.groupby(['PlayerID', 'PlayerName', 'Country', 'ReportPrimaryPosition']).agg({
-        'PerformanceGrade': 'mean',
-        'PotentialGrade': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'N/A',
-        'ReportID': 'count'
-    }).reset_index()
+    player_stats = build_player_stats(df, ('PlayerID', 'PlayerName', 'Country', 'ReportPrimaryPosition'))
     player_stats.columns = ['PlayerID', 'PlayerName', 'Country', 'Position', 'AvgPerformance', 'Potential', 'ReportCount']
     
-    player_stats = player_stats.sort_values('AvgPerformance', ascending=False).head(top_n)
+    player_stats = player_stats.nlargest(top_n, 'AvgPerformance')
     
     # Create color array based on performance
-    colors = [get_performance_color(val) for val in player_stats['AvgPerformance']]
+    colors = get_performance_colors(player_stats['AvgPerformance'])
     
     # Create bar chart with visible axes and labels
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=player_stats['AvgPerformance'],
-        y=player_stats['PlayerName'],
-        orientation='h',
-        marker=dict(
-            color=colors,
-            line=dict(color=CFG_COLORS['border'], width=1)
-        ),
-        text=[f"{val:.2f}" for val in player_stats['AvgPerformance']],
-        textposition='outside',
-        textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{y}</b><br>Performance: %{x:.2f}<br>Potential: %{customdata[0]}<br>Country: %{customdata[1]}<br>Position: %{customdata[2]}<extra></extra>',
-        customdata=player_stats[['Potential', 'Country', 'Position']].values
-    ))
-    
-    fig.update_layout(
-        title=dict(
-            text=f"<b>TOP {top_n} PLAYERS BY AVERAGE PERFORMANCE</b>",
-            x=0.5,
-            font=dict(size=16, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Average Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            gridwidth=1,
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border'],
-            zerolinewidth=1
-        ),
-        yaxis=dict(
-            title=dict(text="", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=10),
-            categoryorder='total ascending'
+    fig = go.Figure(
+        data=go.Bar(
+            x=player_stats['AvgPerformance'],
+            y=player_stats['PlayerName'],
+            orientation='h',
+            marker=dict(
+                color=colors,
+                line=dict(color=CFG_COLORS['border'], width=1)
+            ),
+            text=[f"{val:.2f}" for val in player_stats['AvgPerformance']],
+            textposition='outside',
+            textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{y}</b><br>Performance: %{x:.2f}<br>Potential: %{customdata[0]}<br>Country: %{customdata[1]}<br>Position: %{customdata[2]}<extra></extra>',
+            customdata=hover_columns(player_stats, ['Potential', 'Country', 'Position'])
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=180, r=30, t=80, b=40)
+        layout=dict(
+            title=dict(
+                text=f"<b>TOP {top_n} PLAYERS BY AVERAGE PERFORMANCE</b>",
+                x=0.5,
+                font=dict(size=16, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Average Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE,
+                gridwidth=1,
+                zerolinewidth=1
+            ),
+            yaxis=dict(
+                title=dict(text="", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=10),
+                categoryorder='total ascending'
+            ),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=180, r=30, t=80, b=40)
+        )
     )
     
     return fig, player_stats
@@ -466,55 +774,52 @@ def plot_performance_distribution(df: pd.DataFrame):
     """Plot performance grade distribution with visible axes."""
     perf_dist = df['PerformanceGrade'].value_counts().sort_index()
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=perf_dist.index,
-        y=perf_dist.values,
-        marker=dict(
-            color=perf_dist.values,
-            colorscale='Blues',
-            showscale=True,
-            colorbar=dict(title="Count")
-        ),
-        text=perf_dist.values,
-        textposition='outside',
-        textfont=dict(size=12, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>Grade %{x}</b><br>Count: %{y}<br>Percentage: %{customdata:.1f}%<extra></extra>',
-        customdata=(perf_dist.values / len(df) * 100)
-    ))
+    # Plain numpy arrays (not nullable extension arrays), built once and shared by
+    # y, colour and text so Plotly serializes them on its fast path
+    grades = perf_dist.index.to_numpy(dtype=np.int32)
+    counts = perf_dist.to_numpy(dtype=np.int32)
+    pct = counts.astype(np.float32) * np.float32(100.0 / max(len(df), 1))
     
-    fig.update_layout(
-        title=dict(
-            text="<b>PERFORMANCE GRADE DISTRIBUTION</b>",
-            x=0.5,
-            font=dict(size=18, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            gridwidth=1,
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border'],
-            zerolinewidth=1
-        ),
-        yaxis=dict(
-            title=dict(text="Number of Reports", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            gridwidth=1,
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border'],
-            zerolinewidth=1
+    fig = go.Figure(
+        data=go.Bar(
+            x=grades,
+            y=counts,
+            marker=dict(
+                color=counts,
+                colorscale='Blues',
+                showscale=True,
+                colorbar=dict(title="Count")
+            ),
+            text=counts,
+            textposition='outside',
+            textfont=dict(size=12, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>Grade %{x}</b><br>Count: %{y}<br>Percentage: %{customdata:.1f}%<extra></extra>',
+            customdata=pct
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40)
+        layout=dict(
+            title=dict(
+                text="<b>PERFORMANCE GRADE DISTRIBUTION</b>",
+                x=0.5,
+                font=dict(size=18, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE,
+                gridwidth=1,
+                zerolinewidth=1
+            ),
+            yaxis=dict(
+                title=dict(text="Number of Reports", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE,
+                gridwidth=1,
+                zerolinewidth=1
+            ),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40)
+        )
     )
     
     return fig
@@ -522,56 +827,44 @@ def plot_performance_distribution(df: pd.DataFrame):
 
 def plot_country_performance(df: pd.DataFrame, top_n: int = 15):
     """Plot average performance by country - single chart."""
-    country_stats = df.groupby('Country').agg({
-        'PerformanceGrade': 'mean',
-        'PlayerID': 'nunique'
-    }).reset_index()
-    
-    country_stats.columns = ['Country', 'AvgPerformance', 'UniquePlayers']
-    country_stats = country_stats[country_stats['UniquePlayers'] >= 5].sort_values('AvgPerformance', ascending=False).head(top_n)
+    country_stats = group_grade_stats(df, 'Country', 5).reset_index().nlargest(top_n, 'AvgPerformance')
     
     # Create colors based on performance
-    colors_perf = [get_performance_color(val) for val in country_stats['AvgPerformance']]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=country_stats['Country'],
-        y=country_stats['AvgPerformance'],
-        name='Performance',
-        marker=dict(color=colors_perf, line=dict(color=CFG_COLORS['border'], width=1)),
-        text=[f"{val:.2f}" for val in country_stats['AvgPerformance']],
-        textposition='outside',
-        textfont=dict(size=10, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<br>Players: %{customdata}<extra></extra>',
-        customdata=country_stats['UniquePlayers']
-    ))
+    colors_perf = get_performance_colors(country_stats['AvgPerformance'])
     
-    fig.update_layout(
-        title=dict(
-            text="<b>AVERAGE PERFORMANCE BY COUNTRY</b>",
-            x=0.5,
-            font=dict(size=16, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Country", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickangle=45,
-            tickfont=dict(color=CFG_COLORS['text'], size=10)
-        ),
-        yaxis=dict(
-            title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            gridcolor=CFG_COLORS['grid'],
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
+    fig = go.Figure(
+        data=go.Bar(
+            x=country_stats['Country'],
+            y=country_stats['AvgPerformance'],
+            name='Performance',
+            marker=dict(color=colors_perf, line=dict(color=CFG_COLORS['border'], width=1)),
+            text=[f"{val:.2f}" for val in country_stats['AvgPerformance']],
+            textposition='outside',
+            textfont=dict(size=10, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<br>Players: %{customdata}<extra></extra>',
+            customdata=country_stats['UniquePlayers']
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40),
-        showlegend=False
+        layout=dict(
+            title=dict(
+                text="<b>AVERAGE PERFORMANCE BY COUNTRY</b>",
+                x=0.5,
+                font=dict(size=16, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Country", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickangle=45,
+                tickfont=dict(color=CFG_COLORS['text'], size=10)
+            ),
+            yaxis=dict(
+                title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                **AXIS_STYLE,
+                tickfont=dict(color=CFG_COLORS['text'], size=11)
+            ),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40),
+            showlegend=False
+        )
     )
     
     return fig
@@ -579,82 +872,58 @@ def plot_country_performance(df: pd.DataFrame, top_n: int = 15):
 
 def plot_country_potential(df: pd.DataFrame, top_n: int = 15, potential_filter: str = 'A'):
     """Plot % players with potential grade by country - single chart."""
-    country_stats = df.groupby('Country').agg({
-        'PlayerID': 'nunique'
+    # Calculate % of unique players with specified potential grade (two groupbys, no per-country scans)
+    unique_players = df.groupby('Country', observed=True)['PlayerID'].nunique()
+    players_with_grade = df[df['PotentialGrade'] == potential_filter].groupby(
+        'Country', observed=True
+    )['PlayerID'].nunique().reindex(unique_players.index, fill_value=0)
+    country_stats = pd.DataFrame({
+        'UniquePlayers': unique_players,
+        'PotentialPct': players_with_grade / unique_players * 100
     }).reset_index()
-    
-    # Calculate % of unique players with specified potential grade
-    high_pot_dict = {}
-    for country in country_stats['Country']:
-        country_df = df[df['Country'] == country]
-        unique_players = country_df['PlayerID'].unique()
-        players_with_grade = country_df[country_df['PotentialGrade'] == potential_filter]['PlayerID'].unique()
-        if len(unique_players) > 0:
-            high_pot_dict[country] = (len(players_with_grade) / len(unique_players)) * 100
-        else:
-            high_pot_dict[country] = 0
-    
-    country_stats['PotentialPct'] = country_stats['Country'].map(high_pot_dict)
-    country_stats.columns = ['Country', 'UniquePlayers', 'PotentialPct']
-    country_stats = country_stats[country_stats['UniquePlayers'] >= 5].sort_values('PotentialPct', ascending=False).head(top_n)
+    country_stats = country_stats[country_stats['UniquePlayers'] >= 5].nlargest(top_n, 'PotentialPct')
     
     # Use same color mapping as performance (Low, Medium, High, Elite)
     # Map percentage to performance-like scale: 0-5% (Low), 5-10% (Medium), 10-15% (High), >15% (Elite)
     max_pct = country_stats['PotentialPct'].max() if len(country_stats) > 0 else 20
-    colors = []
-    for val in country_stats['PotentialPct']:
-        if max_pct > 0:
-            normalized = val / max_pct
-            if normalized < 0.25:
-                colors.append(CFG_COLORS['danger'])  # Low - Red
-            elif normalized < 0.5:
-                colors.append(CFG_COLORS['warning'])  # Medium - Orange
-            elif normalized < 0.75:
-                colors.append(CFG_COLORS['success'])  # High - Teal
-            else:
-                colors.append(CFG_COLORS['primary'])  # Elite - Blue
-        else:
-            colors.append(CFG_COLORS['light_gray'])
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=country_stats['Country'],
-        y=country_stats['PotentialPct'],
-        name=f'Potential {potential_filter}',
-        marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
-        text=[f"{val:.2f}%" for val in country_stats['PotentialPct']],
-        textposition='outside',
-        textfont=dict(size=10, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Potential {potential_filter}: %{y:.2f}%<br>Players: %{customdata}<extra></extra>',
-        customdata=country_stats['UniquePlayers']
-    ))
-    
-    fig.update_layout(
-        title=dict(
-            text=f"<b>% PLAYERS WITH POTENTIAL {potential_filter} BY COUNTRY</b>",
-            x=0.5,
-            font=dict(size=16, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Country", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickangle=45,
-            tickfont=dict(color=CFG_COLORS['text'], size=10)
-        ),
-        yaxis=dict(
-            title=dict(text="Percentage", font=dict(color=CFG_COLORS['text'], size=12)),
-            gridcolor=CFG_COLORS['grid'],
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
+    if max_pct > 0:
+        colors = get_quartile_colors(country_stats['PotentialPct'] / max_pct)
+    else:
+        colors = [CFG_COLORS['light_gray']] * len(country_stats)
+    
+    fig = go.Figure(
+        data=go.Bar(
+            x=country_stats['Country'],
+            y=country_stats['PotentialPct'],
+            name=f'Potential {potential_filter}',
+            marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
+            text=[f"{val:.2f}%" for val in country_stats['PotentialPct']],
+            textposition='outside',
+            textfont=dict(size=10, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{x}</b><br>Potential {potential_filter}: %{y:.2f}%<br>Players: %{customdata}<extra></extra>',
+            customdata=country_stats['UniquePlayers']
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40),
-        showlegend=False
+        layout=dict(
+            title=dict(
+                text=f"<b>% PLAYERS WITH POTENTIAL {potential_filter} BY COUNTRY</b>",
+                x=0.5,
+                font=dict(size=16, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Country", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickangle=45,
+                tickfont=dict(color=CFG_COLORS['text'], size=10)
+            ),
+            yaxis=dict(
+                title=dict(text="Percentage", font=dict(color=CFG_COLORS['text'], size=12)),
+                **AXIS_STYLE,
+                tickfont=dict(color=CFG_COLORS['text'], size=11)
+            ),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40),
+            showlegend=False
+        )
     )
     
     return fig
@@ -662,41 +931,35 @@ def plot_country_potential(df: pd.DataFrame, top_n: int = 15, potential_filter:
 
 def plot_position_performance(df: pd.DataFrame):
     """Plot average performance by position - single chart."""
-    position_stats = df.groupby('ReportPrimaryPosition').agg({
-        'PerformanceGrade': 'mean'
-    }).reset_index()
+    position_stats = df.groupby('ReportPrimaryPosition', observed=True)['PerformanceGrade'].mean().reset_index()
     
     position_stats.columns = ['Position', 'AvgPerformance']
     position_stats = position_stats.sort_values('AvgPerformance', ascending=False)
     
     # Use consistent performance color mapping
-    colors = [get_performance_color(val) for val in position_stats['AvgPerformance']]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=position_stats['Position'],
-        y=position_stats['AvgPerformance'],
-        marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
-        text=[f"{val:.2f}" for val in position_stats['AvgPerformance']],
-        textposition='outside',
-        textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=dict(text="<b>AVERAGE PERFORMANCE BY POSITION</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        xaxis=dict(title=dict(text="Position", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  tickangle=45, tickfont=dict(color=CFG_COLORS['text'], size=10)),
-        yaxis=dict(title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  gridcolor=CFG_COLORS['grid'], tickfont=dict(color=CFG_COLORS['text'], size=10),
-                  showgrid=True, zeroline=True, zerolinecolor=CFG_COLORS['border']),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40),
-        showlegend=False
+    colors = get_performance_colors(position_stats['AvgPerformance'])
+    
+    fig = go.Figure(
+        data=go.Bar(
+            x=position_stats['Position'],
+            y=position_stats['AvgPerformance'],
+            marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
+            text=[f"{val:.2f}" for val in position_stats['AvgPerformance']],
+            textposition='outside',
+            textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<extra></extra>'
+        ),
+        layout=dict(
+            title=dict(text="<b>AVERAGE PERFORMANCE BY POSITION</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
+            xaxis=dict(title=dict(text="Position", font=dict(color=CFG_COLORS['text'], size=11)), 
+                      tickangle=45, tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            yaxis=dict(title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=11)), 
+                      **AXIS_STYLE, tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40),
+            showlegend=False
+        )
     )
     
     return fig
@@ -704,7 +967,7 @@ def plot_position_performance(df: pd.DataFrame):
 
 def plot_position_coverage(df: pd.DataFrame):
     """Plot scouting coverage by position - single chart."""
-    position_stats = df.groupby('ReportPrimaryPosition').agg({
+    position_stats = df.groupby('ReportPrimaryPosition', observed=True).agg({
         'PlayerID': 'nunique'
     }).reset_index()
     
@@ -716,44 +979,30 @@ def plot_position_coverage(df: pd.DataFrame):
     max_players = position_stats['UniquePlayers'].max()
     min_players = position_stats['UniquePlayers'].min()
     range_players = max_players - min_players if max_players > min_players else 1
-    colors = []
-    for val in position_stats['UniquePlayers']:
-        # Normalize to 0-1 and map to same color scale as performance
-        normalized = (val - min_players) / range_players if range_players > 0 else 0
-        if normalized < 0.25:
-            colors.append(CFG_COLORS['danger'])  # Low - Red
-        elif normalized < 0.5:
-            colors.append(CFG_COLORS['warning'])  # Medium - Orange
-        elif normalized < 0.75:
-            colors.append(CFG_COLORS['success'])  # High - Teal
-        else:
-            colors.append(CFG_COLORS['primary'])  # Elite - Blue
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=position_stats['Position'],
-        y=position_stats['UniquePlayers'],
-        marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
-        text=position_stats['UniquePlayers'],
-        textposition='outside',
-        textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Unique Players: %{y}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=dict(text="<b>SCOUTING COVERAGE BY POSITION</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        xaxis=dict(title=dict(text="Position", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  tickangle=45, tickfont=dict(color=CFG_COLORS['text'], size=10)),
-        yaxis=dict(title=dict(text="Unique Players", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  gridcolor=CFG_COLORS['grid'], tickfont=dict(color=CFG_COLORS['text'], size=10),
-                  showgrid=True, zeroline=True, zerolinecolor=CFG_COLORS['border']),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40),
-        showlegend=False
+    # Normalize to 0-1 and map to same color scale as performance
+    colors = get_quartile_colors((position_stats['UniquePlayers'] - min_players) / range_players)
+    
+    fig = go.Figure(
+        data=go.Bar(
+            x=position_stats['Position'],
+            y=position_stats['UniquePlayers'],
+            marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
+            text=position_stats['UniquePlayers'],
+            textposition='outside',
+            textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{x}</b><br>Unique Players: %{y}<extra></extra>'
+        ),
+        layout=dict(
+            title=dict(text="<b>SCOUTING COVERAGE BY POSITION</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
+            xaxis=dict(title=dict(text="Position", font=dict(color=CFG_COLORS['text'], size=11)), 
+                      tickangle=45, tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            yaxis=dict(title=dict(text="Unique Players", font=dict(color=CFG_COLORS['text'], size=11)), 
+                      **AXIS_STYLE, tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40),
+            showlegend=False
+        )
     )
     
     return fig
@@ -761,40 +1010,35 @@ def plot_position_coverage(df: pd.DataFrame):
 
 def plot_age_band_performance(df: pd.DataFrame):
     """Plot performance by age band - single chart."""
-    age_stats = df.groupby('AgeBand').agg({
-        'PerformanceGrade': 'mean'
-    }).reset_index()
+    age_stats = df.groupby('AgeBand', observed=True)['PerformanceGrade'].mean().reset_index()
     
     age_order = ['U18', 'U21', '21-24', '25-29', '30-34', '35+']
     age_stats['AgeBand'] = pd.Categorical(age_stats['AgeBand'], categories=age_order, ordered=True)
     age_stats = age_stats.sort_values('AgeBand')
     
     # Use consistent performance color mapping
-    colors = [get_performance_color(val) for val in age_stats['PerformanceGrade']]
-    
-    fig = go.Figure()
-    fig.add_trace(go.Bar(
-        x=age_stats['AgeBand'],
-        y=age_stats['PerformanceGrade'],
-        marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
-        text=[f"{val:.2f}" for val in age_stats['PerformanceGrade']],
-        textposition='outside',
-        textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=dict(text="<b>PERFORMANCE BY AGE BAND</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        xaxis=dict(title=dict(text="Age Band", font=dict(color=CFG_COLORS['text'], size=11)), tickfont=dict(color=CFG_COLORS['text'], size=10)),
-        yaxis=dict(title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  gridcolor=CFG_COLORS['grid'], tickfont=dict(color=CFG_COLORS['text'], size=10),
-                  showgrid=True, zeroline=True, zerolinecolor=CFG_COLORS['border']),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40),
-        showlegend=False
+    colors = get_performance_colors(age_stats['PerformanceGrade'])
+    
+    fig = go.Figure(
+        data=go.Bar(
+            x=age_stats['AgeBand'],
+            y=age_stats['PerformanceGrade'],
+            marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
+            text=[f"{val:.2f}" for val in age_stats['PerformanceGrade']],
+            textposition='outside',
+            textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<extra></extra>'
+        ),
+        layout=dict(
+            title=dict(text="<b>PERFORMANCE BY AGE BAND</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
+            xaxis=dict(title=dict(text="Age Band", font=dict(color=CFG_COLORS['text'], size=11)), tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            yaxis=dict(title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=11)), 
+                      **AXIS_STYLE, tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40),
+            showlegend=False
+        )
     )
     
     return fig
@@ -802,22 +1046,22 @@ def plot_age_band_performance(df: pd.DataFrame):
 
 def plot_age_band_potential(df: pd.DataFrame, potential_filter: str = 'A'):
     """Plot % players with potential grade by age band - single chart."""
+    # One groupby for both counts: IDs of players without the grade are blanked out,
+    # so nunique on that column counts only players carrying it
     if potential_filter != 'All':
-        df_filtered = df[df['PotentialGrade'] == potential_filter].copy()
+        graded_ids = df['PlayerID'].where(df['PotentialGrade'] == potential_filter)
     else:
-        df_filtered = df.copy()
-    
-    age_stats = df_filtered.groupby('AgeBand').agg({
-        'PlayerID': 'nunique'
-    }).reset_index()
+        graded_ids = df['PlayerID']
     
-    age_stats_full = df.groupby('AgeBand').agg({
-        'PlayerID': 'nunique'
-    }).reset_index()
-    age_stats_full.columns = ['AgeBand', 'TotalPlayers']
+    age_stats = pd.DataFrame({
+        'AgeBand': df['AgeBand'],
+        'PlayerID': graded_ids,
+        'TotalPlayers': df['PlayerID']
+    }).groupby('AgeBand', observed=True).nunique().reset_index()
+    age_stats['HighPotentialPct'] = age_stats['PlayerID'] / age_stats['TotalPlayers'] * 100
     
-    age_stats = age_stats.merge(age_stats_full, on='AgeBand', how='left')
-    age_stats['HighPotentialPct'] = (age_stats['PlayerID'] / age_stats['TotalPlayers'] * 100).fillna(0)
+    # Only age bands with at least one player of the grade are charted
+    age_stats = age_stats[age_stats['PlayerID'] > 0]
     
     age_order = ['U18', 'U21', '21-24', '25-29', '30-34', '35+']
     age_stats['AgeBand'] = pd.Categorical(age_stats['AgeBand'], categories=age_order, ordered=True)
@@ -826,44 +1070,31 @@ def plot_age_band_potential(df: pd.DataFrame, potential_filter: str = 'A'):
     # Map percentage to performance-like scale for consistent colors
     # Treat % as if it were performance: 0-25% (Low), 25-50% (Medium), 50-75% (High), >75% (Elite)
     max_pct = age_stats['HighPotentialPct'].max() if len(age_stats) > 0 else 100
-    colors = []
-    for val in age_stats['HighPotentialPct']:
-        if max_pct > 0:
-            normalized = val / max_pct
-            if normalized < 0.25:
-                colors.append(CFG_COLORS['danger'])  # Low - Red
-            elif normalized < 0.5:
-                colors.append(CFG_COLORS['warning'])  # Medium - Orange
-            elif normalized < 0.75:
-                colors.append(CFG_COLORS['success'])  # High - Teal
-            else:
-                colors.append(CFG_COLORS['primary'])  # Elite - Blue
-        else:
-            colors.append(CFG_COLORS['light_gray'])
-    
-    fig = go.Figure()
-    fig.add_trace(go.Bar(
-        x=age_stats['AgeBand'],
-        y=age_stats['HighPotentialPct'],
-        marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
-        text=[f"{val:.1f}%" for val in age_stats['HighPotentialPct']],
-        textposition='outside',
-        textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Potential {potential_filter}: %{y:.1f}%<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=dict(text=f"<b>% PLAYERS WITH POTENTIAL {potential_filter} BY AGE</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        xaxis=dict(title=dict(text="Age Band", font=dict(color=CFG_COLORS['text'], size=11)), tickfont=dict(color=CFG_COLORS['text'], size=10)),
-        yaxis=dict(title=dict(text="Percentage", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  gridcolor=CFG_COLORS['grid'], tickfont=dict(color=CFG_COLORS['text'], size=10),
-                  showgrid=True, zeroline=True, zerolinecolor=CFG_COLORS['border']),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40),
-        showlegend=False
+    if max_pct > 0:
+        colors = get_quartile_colors(age_stats['HighPotentialPct'] / max_pct)
+    else:
+        colors = [CFG_COLORS['light_gray']] * len(age_stats)
+    
+    fig = go.Figure(
+        data=go.Bar(
+            x=age_stats['AgeBand'],
+            y=age_stats['HighPotentialPct'],
+            marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
+            text=[f"{val:.1f}%" for val in age_stats['HighPotentialPct']],
+            textposition='outside',
+            textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{x}</b><br>Potential {potential_filter}: %{y:.1f}%<extra></extra>'
+        ),
+        layout=dict(
+            title=dict(text=f"<b>% PLAYERS WITH POTENTIAL {potential_filter} BY AGE</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
+            xaxis=dict(title=dict(text="Age Band", font=dict(color=CFG_COLORS['text'], size=11)), tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            yaxis=dict(title=dict(text="Percentage", font=dict(color=CFG_COLORS['text'], size=11)), 
+                      **AXIS_STYLE, tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40),
+            showlegend=False
+        )
     )
     
     return fig
@@ -871,7 +1102,7 @@ def plot_age_band_potential(df: pd.DataFrame, potential_filter: str = 'A'):
 
 def plot_age_band_coverage(df: pd.DataFrame):
     """Plot unique players by age band - single chart."""
-    age_stats = df.groupby('AgeBand').agg({
+    age_stats = df.groupby('AgeBand', observed=True).agg({
         'PlayerID': 'nunique'
     }).reset_index()
     
@@ -884,42 +1115,29 @@ def plot_age_band_coverage(df: pd.DataFrame):
     max_players = age_stats['PlayerID'].max()
     min_players = age_stats['PlayerID'].min()
     range_players = max_players - min_players if max_players > min_players else 1
-    colors = []
-    for val in age_stats['PlayerID']:
-        # Normalize to 0-1 and map to same color scale as performance
-        normalized = (val - min_players) / range_players if range_players > 0 else 0
-        if normalized < 0.25:
-            colors.append(CFG_COLORS['danger'])  # Low - Red
-        elif normalized < 0.5:
-            colors.append(CFG_COLORS['warning'])  # Medium - Orange
-        elif normalized < 0.75:
-            colors.append(CFG_COLORS['success'])  # High - Teal
-        else:
-            colors.append(CFG_COLORS['primary'])  # Elite - Blue
-    
-    fig = go.Figure()
-    fig.add_trace(go.Bar(
-        x=age_stats['AgeBand'],
-        y=age_stats['PlayerID'],
-        marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
-        text=age_stats['PlayerID'],
-        textposition='outside',
-        textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Unique Players: %{y}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=dict(text="<b>SCOUTING COVERAGE BY AGE BAND</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        xaxis=dict(title=dict(text="Age Band", font=dict(color=CFG_COLORS['text'], size=11)), tickfont=dict(color=CFG_COLORS['text'], size=10)),
-        yaxis=dict(title=dict(text="Unique Players", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  gridcolor=CFG_COLORS['grid'], tickfont=dict(color=CFG_COLORS['text'], size=10),
-                  showgrid=True, zeroline=True, zerolinecolor=CFG_COLORS['border']),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40),
-        showlegend=False
+    # Normalize to 0-1 and map to same color scale as performance
+    colors = get_quartile_colors((age_stats['PlayerID'] - min_players) / range_players)
+    
+    fig = go.Figure(
+        data=go.Bar(
+            x=age_stats['AgeBand'],
+            y=age_stats['PlayerID'],
+            marker=dict(color=colors, line=dict(color=CFG_COLORS['border'], width=1)),
+            text=age_stats['PlayerID'],
+            textposition='outside',
+            textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{x}</b><br>Unique Players: %{y}<extra></extra>'
+        ),
+        layout=dict(
+            title=dict(text="<b>SCOUTING COVERAGE BY AGE BAND</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
+            xaxis=dict(title=dict(text="Age Band", font=dict(color=CFG_COLORS['text'], size=11)), tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            yaxis=dict(title=dict(text="Unique Players", font=dict(color=CFG_COLORS['text'], size=11)), 
+                      **AXIS_STYLE, tickfont=dict(color=CFG_COLORS['text'], size=10)),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40),
+            showlegend=False
+        )
     )
     
     return fig
@@ -927,9 +1145,7 @@ def plot_age_band_coverage(df: pd.DataFrame):
 
 def plot_foot_performance(df: pd.DataFrame):
     """Plot average performance by preferred foot as a pie chart."""
-    foot_stats = df.groupby('ReportFoot').agg({
-        'PerformanceGrade': 'mean'
-    }).reset_index()
+    foot_stats = df.groupby('ReportFoot', observed=True)['PerformanceGrade'].mean().reset_index()
     
     foot_stats.columns = ['ReportFoot', 'AvgPerformance']
     foot_stats = foot_stats.sort_values('AvgPerformance', ascending=False)
@@ -943,22 +1159,21 @@ def plot_foot_performance(df: pd.DataFrame):
     }
     colors = [color_map.get(foot, CFG_COLORS['primary']) for foot in foot_stats['ReportFoot']]
     
-    fig = go.Figure(go.Pie(
-        labels=foot_stats['ReportFoot'],
-        values=foot_stats['AvgPerformance'],
-        marker=dict(colors=colors, line=dict(color=CFG_COLORS['border'], width=1)),
-        hovertemplate='<b>%{label}</b><br>Avg Performance: %{value:.2f}<extra></extra>',
-        textinfo='label+percent',
-        textfont=dict(color=CFG_COLORS['text'])
-    ))
-    
-    fig.update_layout(
-        title=dict(text="<b>AVERAGE PERFORMANCE BY PREFERRED FOOT</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        showlegend=True
+    fig = go.Figure(
+        data=go.Pie(
+            labels=foot_stats['ReportFoot'],
+            values=foot_stats['AvgPerformance'],
+            marker=dict(colors=colors, line=dict(color=CFG_COLORS['border'], width=1)),
+            hovertemplate='<b>%{label}</b><br>Avg Performance: %{value:.2f}<extra></extra>',
+            textinfo='label+percent',
+            textfont=dict(color=CFG_COLORS['text'])
+        ),
+        layout=dict(
+            title=dict(text="<b>AVERAGE PERFORMANCE BY PREFERRED FOOT</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
+            **BASE_LAYOUT,
+            height=450,
+            showlegend=True
+        )
     )
     
     return fig
@@ -966,7 +1181,7 @@ def plot_foot_performance(df: pd.DataFrame):
 
 def plot_foot_distribution(df: pd.DataFrame):
     """Plot player distribution by preferred foot as a pie chart."""
-    foot_stats = df.groupby('ReportFoot').agg({
+    foot_stats = df.groupby('ReportFoot', observed=True).agg({
         'PlayerID': 'nunique'
     }).reset_index()
     
@@ -981,66 +1196,44 @@ def plot_foot_distribution(df: pd.DataFrame):
     }
     colors = [color_map.get(foot, CFG_COLORS['primary']) for foot in foot_stats['ReportFoot']]
     
-    fig = go.Figure(go.Pie(
-        labels=foot_stats['ReportFoot'],
-        values=foot_stats['UniquePlayers'],
-        marker=dict(colors=colors, line=dict(color=CFG_COLORS['border'], width=1)),
-        hovertemplate='<b>%{label}</b><br>Players: %{value}<extra></extra>',
-        textinfo='label+percent',
-        textfont=dict(color=CFG_COLORS['text'])
-    ))
-    
-    fig.update_layout(
-        title=dict(text="<b>PLAYER DISTRIBUTION BY FOOT</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        showlegend=True
+    fig = go.Figure(
+        data=go.Pie(
+            labels=foot_stats['ReportFoot'],
+            values=foot_stats['UniquePlayers'],
+            marker=dict(colors=colors, line=dict(color=CFG_COLORS['border'], width=1)),
+            hovertemplate='<b>%{label}</b><br>Players: %{value}<extra></extra>',
+            textinfo='label+percent',
+            textfont=dict(color=CFG_COLORS['text'])
+        ),
+        layout=dict(
+            title=dict(text="<b>PLAYER DISTRIBUTION BY FOOT</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
+            **BASE_LAYOUT,
+            height=450,
+            showlegend=True
+        )
     )
     
     return fig
 
 
-def plot_team_performance(df: pd.DataFrame, top_n: int = 15):
+def plot_team_performance(df: pd.DataFrame, top_n: int = 15, team_stats: pd.DataFrame = None):
     """Plot team performance analysis with visible axes."""
-    # Filter out teams with no name
-    df_teams = df[df['CurrentTeam'].notna() & (df['CurrentTeam'] != '')].copy()
-    
-    if len(df_teams) == 0:
+    # The aggregation comes from build_team_stats (or the caller's copy of it);
+    # only check that some rows name a team
+    has_team = df['CurrentTeam'].notna() & (df['CurrentTeam'] != '')
+    if not has_team.any():
         st.warning("No team data available for analysis.")
         return
     
-    # Calculate High Potential correctly: % of unique players with Potential A
-    team_stats = df_teams.groupby('CurrentTeam').agg({
-        'PerformanceGrade': 'mean',
-        'PlayerID': 'nunique'
-    }).reset_index()
-    
-    # Calculate % of unique players with Potential A - FIXED
-    high_pot_dict = {}
-    for team in team_stats['CurrentTeam']:
-        team_df = df_teams[df_teams['CurrentTeam'] == team]
-        # Get unique players for this team
-        unique_players_list = team_df['PlayerID'].unique()
-        unique_players_count = len(unique_players_list)
-        
-        # Get unique players with Potential A for this team
-        players_with_a_df = team_df[team_df['PotentialGrade'] == 'A']
-        players_with_a_list = players_with_a_df['PlayerID'].unique()
-        players_with_a_count = len(players_with_a_list)
-        
-        if unique_players_count > 0:
-            high_pot_dict[team] = (players_with_a_count / unique_players_count) * 100
-        else:
-            high_pot_dict[team] = 0
-    
-    team_stats['HighPotentialPct'] = team_stats['CurrentTeam'].map(high_pot_dict)
-    team_stats.columns = ['Team', 'AvgPerformance', 'UniquePlayers', 'HighPotentialPct']
-    team_stats = team_stats[team_stats['UniquePlayers'] >= 3].sort_values('AvgPerformance', ascending=False).head(top_n)
+    # High Potential: % of unique players with Potential A
+    if team_stats is None:
+        team_stats = build_team_stats(df)
+    team_stats = team_stats.nlargest(top_n, 'AvgPerformance')
     
     # Create colors based on performance
-    colors_perf = [get_performance_color(val) for val in team_stats['AvgPerformance']]
+    colors_perf = get_performance_colors(team_stats['AvgPerformance'])
+    # Both subplots share the same x categories; convert them to an array once
+    team_names = team_stats['Team'].to_numpy()
     
     fig = make_subplots(
         rows=1, cols=2,
@@ -1050,7 +1243,7 @@ def plot_team_performance(df: pd.DataFrame, top_n: int = 15):
     
     fig.add_trace(
         go.Bar(
-            x=team_stats['Team'],
+            x=team_names,
             y=team_stats['AvgPerformance'],
             name='Performance',
             marker=dict(color=colors_perf, line=dict(color=CFG_COLORS['border'], width=1)),
@@ -1065,7 +1258,7 @@ def plot_team_performance(df: pd.DataFrame, top_n: int = 15):
     
     fig.add_trace(
         go.Bar(
-            x=team_stats['Team'],
+            x=team_names,
             y=team_stats['HighPotentialPct'],
             name='High Potential',
             marker_color=CFG_COLORS['success'],
@@ -1092,20 +1285,14 @@ def plot_team_performance(df: pd.DataFrame, top_n: int = 15):
     fig.update_yaxes(
         title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)), 
         row=1, col=1, 
-        gridcolor=CFG_COLORS['grid'],
-        tickfont=dict(color=CFG_COLORS['text'], size=11),
-        showgrid=True,
-        zeroline=True,
-        zerolinecolor=CFG_COLORS['border']
+        **AXIS_STYLE,
+        tickfont=dict(color=CFG_COLORS['text'], size=11)
     )
     fig.update_yaxes(
         title=dict(text="Percentage", font=dict(color=CFG_COLORS['text'], size=12)), 
         row=1, col=2, 
-        gridcolor=CFG_COLORS['grid'],
-        tickfont=dict(color=CFG_COLORS['text'], size=11),
-        showgrid=True,
-        zeroline=True,
-        zerolinecolor=CFG_COLORS['border']
+        **AXIS_STYLE,
+        tickfont=dict(color=CFG_COLORS['text'], size=11)
     )
     
     fig.update_layout(
@@ -1114,14 +1301,12 @@ def plot_team_performance(df: pd.DataFrame, top_n: int = 15):
             x=0.5,
             font=dict(size=18, color=CFG_COLORS['secondary'])
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
+        **BASE_LAYOUT,
         height=500,
         showlegend=False
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key='chart_team_performance')
     
     st.warning("""
     **STRATEGIC INSIGHT:** Team performance analysis identifies feeder clubs and strategic partnership opportunities. Clubs consistently producing 
@@ -1136,24 +1321,24 @@ def plot_team_performance(df: pd.DataFrame, top_n: int = 15):
     """)
 
 
+# Potential grades on the scatter's y-axis: F/U/UJ share the bottom level
+POTENTIAL_DTYPE = pd.CategoricalDtype(['F', 'U', 'UJ', 'E', 'D', 'C', 'B', 'A'])
+POTENTIAL_LEVELS = np.array([0, 0, 0, 1, 2, 3, 4, 5], dtype=np.int8)
+
+
 def plot_scatter_performance_vs_potential(df: pd.DataFrame):
     """Plot scatter chart: Performance vs Potential with age bands."""
     # Create player-level aggregation
-    player_stats = df.groupby(['PlayerID', 'PlayerName', 'AgeBand', 'Country', 'ReportPrimaryPosition']).agg({
-        'PerformanceGrade': 'mean',
-        'PotentialGrade': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'N/A',
-        'ReportID': 'count'
-    }).reset_index()
+    player_stats = build_player_stats(df, ('PlayerID', 'PlayerName', 'AgeBand', 'Country', 'ReportPrimaryPosition'))
     player_stats.columns = ['PlayerID', 'PlayerName', 'AgeBand', 'Country', 'Position', 'AvgPerformance', 'Potential', 'ReportCount']
     
-    # Map potential grades to numbers for visualization
-    potential_map = {'A': 5, 'B': 4, 'C': 3, 'D': 2, 'E': 1, 'F': 0, 'U': 0, 'UJ': 0, 'N/A': 0}
-    player_stats['PotentialNum'] = player_stats['Potential'].map(potential_map)
+    # Map potential grades to numbers for visualization: one categorical encode gives
+    # a code per grade (-1 for 'N/A'), looked up in the level table; N/A rows are dropped
+    potential_codes = pd.Categorical(player_stats['Potential'], dtype=POTENTIAL_DTYPE).codes
+    has_potential = potential_codes >= 0
+    player_stats = player_stats[has_potential].assign(PotentialNum=POTENTIAL_LEVELS[potential_codes[has_potential]])
     
-    # Filter out N/A
-    player_stats = player_stats[player_stats['Potential'] != 'N/A']
-    
-    fig = go.Figure()
+    traces = []
     
     # Color by age band
     age_bands = player_stats['AgeBand'].unique()
@@ -1166,64 +1351,79 @@ def plot_scatter_performance_vs_potential(df: pd.DataFrame):
         '35+': CFG_COLORS['danger']
     }
     
+    # Players without an age band are not plotted; the rest get a per-point band colour
+    band_codes = player_stats['AgeBand'].cat.codes.to_numpy()
+    band_palette = np.array(
+        [colors_map.get(band, CFG_COLORS['primary']) for band in player_stats['AgeBand'].cat.categories],
+        dtype=object
+    )
+    player_stats = player_stats[band_codes >= 0]
+    band_codes = band_codes[band_codes >= 0]
+    
+    # WebGL: a single trace holds every player (one marker each), so the chart stays one
+    # draw call as the dataset grows
+    traces.append(go.Scattergl(
+        x=player_stats['AvgPerformance'],
+        y=player_stats['PotentialNum'],
+        mode='markers',
+        showlegend=False,
+        marker=dict(
+            size=player_stats['ReportCount'] * 2 + 12,
+            color=band_palette[band_codes],
+            opacity=0.8,
+            line=dict(width=2, color=CFG_COLORS['border']),
+            sizemode='diameter'
+        ),
+        text=player_stats['PlayerName'],
+        hovertemplate='<b>%{text}</b><br>Performance: %{x:.2f}<br>Potential: %{customdata[0]}<br>Age: %{customdata[1]}<br>Position: %{customdata[2]}<br>Reports: %{customdata[3]}<extra></extra>',
+        customdata=hover_columns(player_stats, ['Potential', 'AgeBand', 'Position', 'ReportCount'])
+    ))
+    
+    # Empty marker-only traces keep the age band legend
     for age_band in age_bands:
-        age_data = player_stats[player_stats['AgeBand'] == age_band]
-        if len(age_data) == 0:
+        if pd.isna(age_band):
             continue
-        fig.add_trace(go.Scatter(
-            x=age_data['AvgPerformance'],
-            y=age_data['PotentialNum'],
+        traces.append(go.Scattergl(
+            x=[None],
+            y=[None],
             mode='markers',
             name=age_band,
-            marker=dict(
-                size=age_data['ReportCount'] * 2 + 12,
-                color=colors_map.get(age_band, CFG_COLORS['primary']),
-                opacity=0.8,
-                line=dict(width=2, color=CFG_COLORS['border']),
-                sizemode='diameter'
-            ),
-            text=age_data['PlayerName'],
-            hovertemplate='<b>%{text}</b><br>Performance: %{x:.2f}<br>Potential: %{customdata[0]}<br>Age: %{customdata[1]}<br>Position: %{customdata[2]}<br>Reports: %{customdata[3]}<extra></extra>',
-            customdata=age_data[['Potential', 'AgeBand', 'Position', 'ReportCount']].values
+            marker=dict(size=12, color=colors_map.get(age_band, CFG_COLORS['primary']), opacity=0.8),
+            hoverinfo='skip'
         ))
     
-    fig.update_layout(
-        title=dict(
-            text="<b>PERFORMANCE vs POTENTIAL ANALYSIS</b>",
-            x=0.5,
-            font=dict(size=16, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Average Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
-        ),
-        yaxis=dict(
-            title=dict(text="Potential Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            tickmode='array',
-            tickvals=[0, 1, 2, 3, 4, 5],
-            ticktext=['F/U', 'E', 'D', 'C', 'B', 'A'],
-            gridcolor=CFG_COLORS['grid'],
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
-        ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=40),
-        legend=dict(
-            title=dict(text="Age Band", font=dict(color=CFG_COLORS['text'], size=11)),
-            font=dict(color=CFG_COLORS['text'], size=10)
+    fig = go.Figure(
+        data=traces,
+        layout=dict(
+            title=dict(
+                text="<b>PERFORMANCE vs POTENTIAL ANALYSIS</b>",
+                x=0.5,
+                font=dict(size=16, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Average Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE
+            ),
+            yaxis=dict(
+                title=dict(text="Potential Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                tickmode='array',
+                tickvals=[0, 1, 2, 3, 4, 5],
+                ticktext=['F/U', 'E', 'D', 'C', 'B', 'A'],
+                **AXIS_STYLE
+            ),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=80, b=40),
+            legend=dict(
+                title=dict(text="Age Band", font=dict(color=CFG_COLORS['text'], size=11)),
+                font=dict(color=CFG_COLORS['text'], size=10)
+            )
         )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key='chart_performance_vs_potential')
     
     st.success("""
     **STRATEGIC INSIGHT:** This analysis identifies the "golden quadrant" - players combining elite current performance with exceptional 
@@ -1240,20 +1440,20 @@ def plot_scatter_performance_vs_potential(df: pd.DataFrame):
 
 def plot_high_potential_players(df: pd.DataFrame, top_n: int = 20, potential_filter: str = 'A'):
     """Plot players with specified potential grade."""
-    # Get all players with specified potential grade
-    high_pot_players = df[df['PotentialGrade'] == potential_filter].groupby(['PlayerID', 'PlayerName', 'Country', 'ReportPrimaryPosition', 'AgeBand']).agg({
-        'PerformanceGrade': ['mean', 'count'],
-        'PotentialGrade': 'first'
-    }).reset_index()
-    high_pot_players.columns = ['PlayerID', 'PlayerName', 'Country', 'Position', 'AgeBand', 'AvgPerformance', 'ReportCount', 'Potential']
+    # Get all players with specified potential grade; only the numeric column is aggregated,
+    # since every remaining row already carries potential_filter as its grade
+    high_pot_players = df[df['PotentialGrade'] == potential_filter].groupby(
+        ['PlayerID', 'PlayerName', 'Country', 'ReportPrimaryPosition', 'AgeBand'], observed=True, sort=False
+    )['PerformanceGrade'].agg(['mean', 'count']).reset_index()
+    high_pot_players.columns = ['PlayerID', 'PlayerName', 'Country', 'Position', 'AgeBand', 'AvgPerformance', 'ReportCount']
+    high_pot_players['Potential'] = potential_filter
     
-    high_pot_players = high_pot_players.sort_values('AvgPerformance', ascending=False).head(top_n)
+    high_pot_players = high_pot_players.nlargest(top_n, 'AvgPerformance')
     
     if len(high_pot_players) == 0:
         st.warning(f"No players with Potential {potential_filter} found in the filtered dataset.")
         # Return empty figure and empty dataframe to prevent unpacking error
-        empty_fig = go.Figure()
-        empty_fig.update_layout(
+        empty_fig = go.Figure(layout=dict(
             title=dict(
                 text=f"<b>HIGH POTENTIAL PLAYERS (Grade {potential_filter}) - TOP {top_n}</b>",
                 x=0.5,
@@ -1262,56 +1462,50 @@ def plot_high_potential_players(df: pd.DataFrame, top_n: int = 20, potential_fil
             plot_bgcolor='white',
             paper_bgcolor='white',
             height=450
-        )
+        ))
         empty_df = pd.DataFrame(columns=['PlayerID', 'PlayerName', 'Country', 'Position', 'AgeBand', 'AvgPerformance', 'ReportCount', 'Potential'])
         return empty_fig, empty_df
     
     # Create colors based on performance
-    colors = [get_performance_color(val) for val in high_pot_players['AvgPerformance']]
+    colors = get_performance_colors(high_pot_players['AvgPerformance'])
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=high_pot_players['AvgPerformance'],
-        y=high_pot_players['PlayerName'],
-        orientation='h',
-        marker=dict(
-            color=colors,
-            line=dict(color=CFG_COLORS['border'], width=1)
-        ),
-        text=[f"{val:.2f}" for val in high_pot_players['AvgPerformance']],
-        textposition='outside',
-        textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{y}</b><br>Performance: %{x:.2f}<br>Country: %{customdata[0]}<br>Position: %{customdata[1]}<br>Age: %{customdata[2]}<br>Reports: %{customdata[3]}<extra></extra>',
-        customdata=high_pot_players[['Country', 'Position', 'AgeBand', 'ReportCount']].values
-    ))
-    
-    fig.update_layout(
-        title=dict(
-            text=f"<b>HIGH POTENTIAL PLAYERS (Grade {potential_filter}) - TOP {top_n}</b>",
-            x=0.5,
-            font=dict(size=14, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Average Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            gridwidth=1,
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border'],
-            zerolinewidth=1
-        ),
-        yaxis=dict(
-            title=dict(text="", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=10),
-            categoryorder='total ascending'
+    fig = go.Figure(
+        data=go.Bar(
+            x=high_pot_players['AvgPerformance'],
+            y=high_pot_players['PlayerName'],
+            orientation='h',
+            marker=dict(
+                color=colors,
+                line=dict(color=CFG_COLORS['border'], width=1)
+            ),
+            text=[f"{val:.2f}" for val in high_pot_players['AvgPerformance']],
+            textposition='outside',
+            textfont=dict(size=11, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{y}</b><br>Performance: %{x:.2f}<br>Country: %{customdata[0]}<br>Position: %{customdata[1]}<br>Age: %{customdata[2]}<br>Reports: %{customdata[3]}<extra></extra>',
+            customdata=hover_columns(high_pot_players, ['Country', 'Position', 'AgeBand', 'ReportCount'])
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=180, r=30, t=80, b=40)
+        layout=dict(
+            title=dict(
+                text=f"<b>HIGH POTENTIAL PLAYERS (Grade {potential_filter}) - TOP {top_n}</b>",
+                x=0.5,
+                font=dict(size=14, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Average Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE,
+                gridwidth=1,
+                zerolinewidth=1
+            ),
+            yaxis=dict(
+                title=dict(text="", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=10),
+                categoryorder='total ascending'
+            ),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=180, r=30, t=80, b=40)
+        )
     )
     
     return fig, high_pot_players
@@ -1323,29 +1517,27 @@ def plot_player_comparison(df: pd.DataFrame, player_ids: list):
         st.warning("Please select 2 or 3 players to compare.")
         return
     
-    comparison_data = []
-    for player_id in player_ids:
-        player_df = df[df['PlayerID'] == player_id]
-        if len(player_df) == 0:
-            continue
-        
-        player_name = player_df['PlayerName'].iloc[0]
-        comparison_data.append({
-            'Player': player_name,
-            'Avg Performance': round(player_df['PerformanceGrade'].mean(), 2),
-            'Potential': player_df['PotentialGrade'].mode()[0] if len(player_df['PotentialGrade'].mode()) > 0 else 'N/A',
-            'Reports': len(player_df),
-            'Country': player_df['Country'].iloc[0],
-            'Position': player_df['ReportPrimaryPosition'].mode()[0] if len(player_df['ReportPrimaryPosition'].mode()) > 0 else 'N/A',
-            'Age Band': player_df['AgeBand'].mode()[0] if len(player_df['AgeBand'].mode()) > 0 else 'N/A'
-        })
-    
-    if len(comparison_data) < 2:
+    # One groupby over the selected players' rows; modes come from group_mode
+    # (ties -> smallest value, like .mode()[0]) instead of three .mode() calls per player
+    selected = df[df['PlayerID'].isin(player_ids)]
+    grouped = selected.groupby('PlayerID', sort=False)
+    comp_df = pd.DataFrame({
+        'Player': grouped['PlayerName'].first(),
+        'Avg Performance': grouped['PerformanceGrade'].mean().round(2),
+        'Potential': group_mode(selected, ['PlayerID'], 'PotentialGrade'),
+        'Reports': grouped.size(),
+        'Country': grouped['Country'].first(),
+        'Position': group_mode(selected, ['PlayerID'], 'ReportPrimaryPosition'),
+        'Age Band': group_mode(selected, ['PlayerID'], 'AgeBand')
+    })
+    comp_df[['Potential', 'Position', 'Age Band']] = comp_df[['Potential', 'Position', 'Age Band']].fillna('N/A')
+    # Keep the selection order (players with no rows in the filtered data are skipped)
+    comp_df = comp_df.reindex([player_id for player_id in player_ids if player_id in comp_df.index])
+    
+    if len(comp_df) < 2:
         st.warning("Not enough data for comparison.")
         return
     
-    comp_df = pd.DataFrame(comparison_data)
-    
     # Create comparison chart
     fig = make_subplots(
         rows=1, cols=2,
@@ -1388,20 +1580,14 @@ def plot_player_comparison(df: pd.DataFrame, player_ids: list):
     fig.update_yaxes(
         title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)), 
         row=1, col=1, 
-        gridcolor=CFG_COLORS['grid'],
-        tickfont=dict(color=CFG_COLORS['text'], size=11),
-        showgrid=True,
-        zeroline=True,
-        zerolinecolor=CFG_COLORS['border']
+        **AXIS_STYLE,
+        tickfont=dict(color=CFG_COLORS['text'], size=11)
     )
     fig.update_yaxes(
         title=dict(text="Number of Reports", font=dict(color=CFG_COLORS['text'], size=12)), 
         row=1, col=2, 
-        gridcolor=CFG_COLORS['grid'],
-        tickfont=dict(color=CFG_COLORS['text'], size=11),
-        showgrid=True,
-        zeroline=True,
-        zerolinecolor=CFG_COLORS['border']
+        **AXIS_STYLE,
+        tickfont=dict(color=CFG_COLORS['text'], size=11)
     )
     
     fig.update_layout(
@@ -1410,14 +1596,12 @@ def plot_player_comparison(df: pd.DataFrame, player_ids: list):
             x=0.5,
             font=dict(size=18, color=CFG_COLORS['secondary'])
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
+        **BASE_LAYOUT,
         height=500,
         showlegend=False
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key='chart_player_comparison')
     
     # Comparison table
     st.dataframe(comp_df, use_container_width=True, hide_index=True)
@@ -1435,9 +1619,39 @@ def plot_player_comparison(df: pd.DataFrame, player_ids: list):
     """)
 
 
+# Upper bound on points drawn per line in time-series charts
+MAX_TREND_POINTS = 1000
+
+
+def downsample_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Return indices of the points kept by Largest-Triangle-Three-Buckets downsampling."""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    # Average of the next bucket (or the last point) closes each triangle; all of them
+    # are computed up front in one reduceat pass, leaving only the argmax in the loop
+    bucket_sizes = np.diff(np.append(edges[1:], n))
+    next_x = np.add.reduceat(x, edges[1:]) / bucket_sizes
+    next_y = np.add.reduceat(y, edges[1:]) / bucket_sizes
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        areas = np.abs(
+            (x[prev] - next_x[i]) * (y[start:end] - y[prev]) -
+            (x[prev] - x[start:end]) * (next_y[i] - y[prev])
+        )
+        prev = start + int(np.argmax(areas))
+        keep[i + 1] = prev
+    return keep
+
 def plot_player_trend(df: pd.DataFrame, player_id: str):
     """Plot performance evolution over time for a specific player."""
-    player_df = df[df['PlayerID'] == player_id].copy()
+    player_df = df[df['PlayerID'] == player_id]
     
     if len(player_df) == 0:
         st.warning("Player not found in dataset.")
@@ -1448,26 +1662,56 @@ def plot_player_trend(df: pd.DataFrame, player_id: str):
         return
     
     player_name = player_df['PlayerName'].iloc[0]
-    player_df = player_df[player_df['MatchDate'].notna()].sort_values('MatchDate')
+    player_df = player_df[player_df['MatchDate'].notna()]
+    # Reports are stored in MatchDate order, so the sort is normally skipped
+    if not player_df['MatchDate'].is_monotonic_increasing:
+        player_df = player_df.sort_values('MatchDate')
     
     if len(player_df) < 2:
         st.warning("Not enough data points for trend analysis.")
         return
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=player_df['MatchDate'],
-        y=player_df['PerformanceGrade'],
-        mode='lines+markers',
-        name='Performance',
-        line=dict(color=CFG_COLORS['primary'], width=3),
-        marker=dict(size=10, color=CFG_COLORS['primary']),
-        hovertemplate='<b>Date: %{x}</b><br>Performance: %{y}<br>Potential: %{customdata}<extra></extra>',
-        customdata=player_df['PotentialGrade']
-    ))
+    # Long histories are thinned to a shape-preserving subset before sending to the browser;
+    # the kept points are gathered as plain arrays for Plotly
+    dates = player_df['MatchDate'].to_numpy()
+    grades = player_df['PerformanceGrade'].to_numpy(dtype=float, na_value=np.nan)
+    keep = downsample_lttb(dates.astype('int64').astype(float), grades, MAX_TREND_POINTS)
+    
+    # WebGL line: the trace can carry up to MAX_TREND_POINTS markers
+    fig = go.Figure(
+        data=go.Scattergl(
+            x=dates[keep],
+            y=grades[keep],
+            mode='lines+markers',
+            name='Performance',
+            line=dict(color=CFG_COLORS['primary'], width=3),
+            marker=dict(size=10, color=CFG_COLORS['primary']),
+            hovertemplate='<b>Date: %{x}</b><br>Performance: %{y}<br>Potential: %{customdata}<extra></extra>',
+            customdata=player_df['PotentialGrade'].to_numpy()[keep]
+        ),
+        layout=dict(
+            title=dict(
+                text=f"<b>PERFORMANCE TREND: {player_name}</b>",
+                x=0.5,
+                font=dict(size=18, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Date", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                gridcolor=CFG_COLORS['grid'],
+                showgrid=True
+            ),
+            yaxis=dict(
+                title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE
+            ),
+            **BASE_LAYOUT,
+            height=500
+        )
+    )
     
-    # Add average line
+    # Add average line (over the full history, not the thinned points)
     avg_perf = player_df['PerformanceGrade'].mean()
     fig.add_hline(
         y=avg_perf,
@@ -1479,33 +1723,7 @@ def plot_player_trend(df: pd.DataFrame, player_id: str):
         annotation_font=dict(color=CFG_COLORS['text'], size=11)
     )
     
-    fig.update_layout(
-        title=dict(
-            text=f"<b>PERFORMANCE TREND: {player_name}</b>",
-            x=0.5,
-            font=dict(size=18, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Date", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            showgrid=True
-        ),
-        yaxis=dict(
-            title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
-        ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key='chart_player_trend')
     
     st.success(f"""
     **STRATEGIC INSIGHT:** Performance trajectory analysis reveals player development patterns and consistency levels critical for recruitment 
@@ -1529,16 +1747,20 @@ def plot_scout_analysis(df: pd.DataFrame):
         st.warning("Scout data not available.")
         return
     
-    scout_stats = df.groupby('ScoutID').agg({
+    scout_stats = df.groupby('ScoutID', observed=True, sort=False).agg({
         'PerformanceGrade': 'mean',
         'PlayerID': 'nunique',
-        'PotentialGrade': lambda x: (x == 'A').sum() / len(x) * 100 if len(x) > 0 else 0,
         'ReportID': 'count'
-    }).reset_index()
+    })
+    # Share of each scout's reports with Potential A: the grouped mean of a boolean
+    # column runs in Cython, where the old per-group lambda ran in Python
+    is_potential_a = df['PotentialGrade'] == 'A'
+    scout_stats.insert(2, 'HighPotentialPct', is_potential_a.groupby(df['ScoutID'], observed=True, sort=False).mean() * 100)
+    scout_stats = scout_stats.reset_index()
     scout_stats.columns = ['ScoutID', 'AvgPerformance', 'UniquePlayers', 'HighPotentialPct', 'TotalReports']
-    scout_stats = scout_stats[scout_stats['TotalReports'] >= 5].sort_values('AvgPerformance', ascending=False).head(20)
+    scout_stats = scout_stats[scout_stats['TotalReports'] >= 5].nlargest(20, 'AvgPerformance')
     
-    colors_scout = [get_performance_color(val) for val in scout_stats['AvgPerformance']]
+    colors_scout = get_performance_colors(scout_stats['AvgPerformance'])
     
     fig = make_subplots(
         rows=1, cols=2,
@@ -1556,7 +1778,7 @@ def plot_scout_analysis(df: pd.DataFrame):
             textposition='outside',
             textfont=dict(size=9, color=CFG_COLORS['text'], weight='bold'),
             hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<br>Players: %{customdata[0]}<br>Reports: %{customdata[1]}<extra></extra>',
-            customdata=scout_stats[['UniquePlayers', 'TotalReports']].values
+            customdata=np.column_stack([scout_stats['UniquePlayers'].to_numpy(), scout_stats['TotalReports'].to_numpy()])
         ),
         row=1, col=1
     )
@@ -1580,20 +1802,14 @@ def plot_scout_analysis(df: pd.DataFrame):
     fig.update_yaxes(
         title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)), 
         row=1, col=1, 
-        gridcolor=CFG_COLORS['grid'],
-        tickfont=dict(color=CFG_COLORS['text'], size=11),
-        showgrid=True,
-        zeroline=True,
-        zerolinecolor=CFG_COLORS['border']
+        **AXIS_STYLE,
+        tickfont=dict(color=CFG_COLORS['text'], size=11)
     )
     fig.update_yaxes(
         title=dict(text="Percentage", font=dict(color=CFG_COLORS['text'], size=12)), 
         row=1, col=2, 
-        gridcolor=CFG_COLORS['grid'],
-        tickfont=dict(color=CFG_COLORS['text'], size=11),
-        showgrid=True,
-        zeroline=True,
-        zerolinecolor=CFG_COLORS['border']
+        **AXIS_STYLE,
+        tickfont=dict(color=CFG_COLORS['text'], size=11)
     )
     
     fig.update_layout(
@@ -1602,14 +1818,12 @@ def plot_scout_analysis(df: pd.DataFrame):
             x=0.5,
             font=dict(size=18, color=CFG_COLORS['secondary'])
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
+        **BASE_LAYOUT,
         height=500,
         showlegend=False
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key='chart_scout_analysis')
     
     st.warning("""
     **STRATEGIC INSIGHT:** Scout performance metrics reveal the effectiveness of our scouting network and identify specialists who consistently 
@@ -1625,65 +1839,57 @@ def plot_scout_analysis(df: pd.DataFrame):
     """)
 
 
-def plot_team_performance_simple(df: pd.DataFrame, top_n: int = 15):
+def plot_team_performance_simple(df: pd.DataFrame, top_n: int = 15, team_stats: pd.DataFrame = None):
     """Plot simple team performance analysis - only average performance."""
-    df_teams = df[df['CurrentTeam'].notna() & (df['CurrentTeam'] != '')].copy()
-    
-    if len(df_teams) == 0:
+    # The aggregation comes from build_team_stats (or the caller's copy of it);
+    # only check that some rows name a team
+    has_team = df['CurrentTeam'].notna() & (df['CurrentTeam'] != '')
+    if not has_team.any():
         st.warning("No team data available for analysis.")
         return
     
-    team_stats = df_teams.groupby('CurrentTeam').agg({
-        'PerformanceGrade': 'mean',
-        'PlayerID': 'nunique'
-    }).reset_index()
-    team_stats.columns = ['Team', 'AvgPerformance', 'UniquePlayers']
-    team_stats = team_stats[team_stats['UniquePlayers'] >= 3].sort_values('AvgPerformance', ascending=False).head(top_n)
+    if team_stats is None:
+        team_stats = build_team_stats(df)
+    team_stats = team_stats.nlargest(top_n, 'AvgPerformance')
     
     # Create colors based on performance
-    colors_perf = [get_performance_color(val) for val in team_stats['AvgPerformance']]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=team_stats['Team'],
-        y=team_stats['AvgPerformance'],
-        name='Performance',
-        marker=dict(color=colors_perf, line=dict(color=CFG_COLORS['border'], width=1)),
-        text=[f"{val:.2f}" for val in team_stats['AvgPerformance']],
-        textposition='outside',
-        textfont=dict(size=10, color=CFG_COLORS['text'], weight='bold'),
-        hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<br>Players: %{customdata}<extra></extra>',
-        customdata=team_stats['UniquePlayers']
-    ))
+    colors_perf = get_performance_colors(team_stats['AvgPerformance'])
     
-    fig.update_layout(
-        title=dict(
-            text="<b>AVERAGE PERFORMANCE BY TEAM</b>",
-            x=0.5,
-            font=dict(size=16, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Team", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickangle=45,
-            tickfont=dict(color=CFG_COLORS['text'], size=10),
-        ),
-        yaxis=dict(
-            title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
+    fig = go.Figure(
+        data=go.Bar(
+            x=team_stats['Team'],
+            y=team_stats['AvgPerformance'],
+            name='Performance',
+            marker=dict(color=colors_perf, line=dict(color=CFG_COLORS['border'], width=1)),
+            text=[f"{val:.2f}" for val in team_stats['AvgPerformance']],
+            textposition='outside',
+            textfont=dict(size=10, color=CFG_COLORS['text'], weight='bold'),
+            hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<br>Players: %{customdata}<extra></extra>',
+            customdata=team_stats['UniquePlayers']
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        showlegend=False
+        layout=dict(
+            title=dict(
+                text="<b>AVERAGE PERFORMANCE BY TEAM</b>",
+                x=0.5,
+                font=dict(size=16, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Team", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickangle=45,
+                tickfont=dict(color=CFG_COLORS['text'], size=10),
+            ),
+            yaxis=dict(
+                title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE
+            ),
+            **BASE_LAYOUT,
+            height=450,
+            showlegend=False
+        )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key='chart_team_performance_simple')
     
     st.info("""
     **WHY THIS MATTERS:** Teams with consistently high-performing players may indicate strong development 
@@ -1694,42 +1900,29 @@ def plot_team_performance_simple(df: pd.DataFrame, top_n: int = 15):
     """)
 
 
-def plot_team_potential_distribution(df: pd.DataFrame, top_n: int = 15):
+def plot_team_potential_distribution(df: pd.DataFrame, top_n: int = 15, team_stats: pd.DataFrame = None):
     """Plot potential grade distribution (A, B, C, D) by team."""
-    df_teams = df[df['CurrentTeam'].notna() & (df['CurrentTeam'] != '')].copy()
+    df_teams = df[df['CurrentTeam'].notna() & (df['CurrentTeam'] != '')]
     
     if len(df_teams) == 0:
         st.warning("No team data available for analysis.")
         return
     
     # Get top teams by performance
-    team_stats = df_teams.groupby('CurrentTeam').agg({
-        'PerformanceGrade': 'mean',
-        'PlayerID': 'nunique'
-    }).reset_index()
-    team_stats = team_stats[team_stats['PlayerID'] >= 3].sort_values('PerformanceGrade', ascending=False).head(top_n)
-    top_teams = team_stats['CurrentTeam'].tolist()
-    
-    # Calculate potential distribution for each team
-    potential_data = []
-    for team in top_teams:
-        team_df = df_teams[df_teams['CurrentTeam'] == team]
-        unique_players = team_df['PlayerID'].nunique()
-        
-        for grade in ['A', 'B', 'C', 'D']:
-            players_with_grade = team_df[team_df['PotentialGrade'] == grade]['PlayerID'].nunique()
-            count = players_with_grade
-            potential_data.append({
-                'Team': team,
-                'Potential': grade,
-                'Count': count,
-                'Percentage': (count / unique_players * 100) if unique_players > 0 else 0
-            })
-    
-    pot_df = pd.DataFrame(potential_data)
+    if team_stats is None:
+        team_stats = build_team_stats(df)
+    team_stats = team_stats.nlargest(top_n, 'AvgPerformance')
+    top_teams = team_stats['Team'].tolist()
+    
+    # Unique players per (team, grade) in one groupby, as a teams x grades table
+    grades = ['A', 'B', 'C', 'D']
+    counts = df_teams.groupby(['CurrentTeam', 'PotentialGrade'], observed=True, sort=False)['PlayerID'].nunique().unstack(
+        fill_value=0
+    ).reindex(index=top_teams, columns=grades, fill_value=0)
+    pcts = counts.div(team_stats['UniquePlayers'].to_numpy(), axis=0) * 100
     
     # Create stacked bar chart
-    fig = go.Figure()
+    traces = []
     
     colors_pot = {
         'A': CFG_COLORS['success'],      # Teal
@@ -1738,57 +1931,54 @@ def plot_team_potential_distribution(df: pd.DataFrame, top_n: int = 15):
         'D': CFG_COLORS['text_secondary']  # Dark gray (replacing red)
     }
     
-    for grade in ['A', 'B', 'C', 'D']:
-        grade_df = pot_df[pot_df['Potential'] == grade]
-        fig.add_trace(go.Bar(
-            x=grade_df['Team'],
-            y=grade_df['Count'],
+    for grade in grades:
+        traces.append(go.Bar(
+            x=top_teams,
+            y=counts[grade],
             name=f'Grade {grade}',
             marker_color=colors_pot[grade],
             hovertemplate='<b>%{x}</b><br>Grade {grade}: %{y} players<br>Percentage: %{customdata:.1f}%<extra></extra>',
-            customdata=grade_df['Percentage']
+            customdata=pcts[grade]
         ))
     
-    fig.update_layout(
-        title=dict(
-            text="<b>POTENTIAL DISTRIBUTION BY TEAM</b>",
-            x=0.5,
-            font=dict(size=16, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Team", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickangle=45,
-            tickfont=dict(color=CFG_COLORS['text'], size=10)
-        ),
-        yaxis=dict(
-            title=dict(text="Number of Players", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
-        ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=100, b=40),
-        barmode='stack',
-        legend=dict(
-            title=dict(text="Potential Grade", font=dict(color=CFG_COLORS['text'], size=11)),
-            orientation="h",
-            yanchor="top",
-            y=1.15,
-            xanchor="center",
-            x=0.5,
-            font=dict(color=CFG_COLORS['text'], size=10),
-            bgcolor='white',
-            bordercolor=CFG_COLORS['border'],
-            borderwidth=1
+    fig = go.Figure(
+        data=traces,
+        layout=dict(
+            title=dict(
+                text="<b>POTENTIAL DISTRIBUTION BY TEAM</b>",
+                x=0.5,
+                font=dict(size=16, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Team", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickangle=45,
+                tickfont=dict(color=CFG_COLORS['text'], size=10)
+            ),
+            yaxis=dict(
+                title=dict(text="Number of Players", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE
+            ),
+            **BASE_LAYOUT,
+            height=450,
+            margin=dict(l=50, r=30, t=100, b=40),
+            barmode='stack',
+            legend=dict(
+                title=dict(text="Potential Grade", font=dict(color=CFG_COLORS['text'], size=11)),
+                orientation="h",
+                yanchor="top",
+                y=1.15,
+                xanchor="center",
+                x=0.5,
+                font=dict(color=CFG_COLORS['text'], size=10),
+                bgcolor='white',
+                bordercolor=CFG_COLORS['border'],
+                borderwidth=1
+            )
         )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key='chart_team_potential')
     
     st.success("""
     **STRATEGIC INSIGHT:** Potential distribution by team reveals which clubs have exceptional development programs capable of nurturing elite 
@@ -1805,81 +1995,65 @@ def plot_team_potential_distribution(df: pd.DataFrame, top_n: int = 15):
     """)
 
 
-def plot_team_scatter(df: pd.DataFrame, top_n: int = 20):
+def plot_team_scatter(df: pd.DataFrame, top_n: int = 20, team_stats: pd.DataFrame = None):
     """Scatter plot: Team performance vs number of high potential players."""
-    df_teams = df[df['CurrentTeam'].notna() & (df['CurrentTeam'] != '')].copy()
-    
-    if len(df_teams) == 0:
+    # The aggregation comes from build_team_stats (or the caller's copy of it);
+    # only check that some rows name a team
+    has_team = df['CurrentTeam'].notna() & (df['CurrentTeam'] != '')
+    if not has_team.any():
         st.warning("No team data available.")
         return
     
-    team_stats = df_teams.groupby('CurrentTeam').agg({
-        'PerformanceGrade': 'mean',
-        'PlayerID': 'nunique'
-    }).reset_index()
-    
-    # Calculate high potential players per team
-    high_pot_dict = {}
-    for team in team_stats['CurrentTeam']:
-        team_df = df_teams[df_teams['CurrentTeam'] == team]
-        unique_players = team_df['PlayerID'].nunique()
-        players_with_a = team_df[team_df['PotentialGrade'] == 'A']['PlayerID'].nunique()
-        high_pot_dict[team] = players_with_a
-    
-    team_stats['HighPotentialCount'] = team_stats['CurrentTeam'].map(high_pot_dict)
-    team_stats = team_stats[team_stats['PlayerID'] >= 3].sort_values('PerformanceGrade', ascending=False).head(top_n)
-    
-    colors_team = [get_performance_color(val) for val in team_stats['PerformanceGrade']]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=team_stats['PerformanceGrade'],
-        y=team_stats['HighPotentialCount'],
-        mode='markers+text',
-        name='Teams',
-        marker=dict(
-            size=team_stats['PlayerID'] * 2 + 15,
-            color=colors_team,
-            opacity=0.7,
-            line=dict(width=2, color=CFG_COLORS['border'])
-        ),
-        text=team_stats['CurrentTeam'],
-        textposition='top center',
-        textfont=dict(size=9, color=CFG_COLORS['text']),
-        hovertemplate='<b>%{text}</b><br>Performance: %{x:.2f}<br>High Potential Players: %{y}<br>Total Players: %{customdata}<extra></extra>',
-        customdata=team_stats['PlayerID']
-    ))
-    
-    fig.update_layout(
-        title=dict(
-            text="<b>TEAM ANALYSIS: PERFORMANCE vs HIGH POTENTIAL PLAYERS</b>",
-            x=0.5,
-            font=dict(size=18, color=CFG_COLORS['secondary'])
-        ),
-        xaxis=dict(
-            title=dict(text="Average Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
-        ),
-        yaxis=dict(
-            title=dict(text="Number of High Potential Players (Grade A)", font=dict(color=CFG_COLORS['text'], size=12)),
-            tickfont=dict(color=CFG_COLORS['text'], size=11),
-            gridcolor=CFG_COLORS['grid'],
-            showgrid=True,
-            zeroline=True,
-            zerolinecolor=CFG_COLORS['border']
+    if team_stats is None:
+        team_stats = build_team_stats(df)
+    team_stats = team_stats.nlargest(top_n, 'AvgPerformance')
+    
+    colors_team = get_performance_colors(team_stats['AvgPerformance'])
+    # Plain NumPy arrays for the numeric channels; the bubble size is array arithmetic
+    # and the player counts are shared by size and hover
+    team_players = team_stats['UniquePlayers'].to_numpy()
+    
+    fig = go.Figure(
+        data=go.Scattergl(
+            x=team_stats['AvgPerformance'].to_numpy(),
+            y=team_stats['HighPotentialCount'].to_numpy(),
+            # Team names stay in the hover; drawn labels only while the chart is readable
+            mode='markers+text' if len(team_stats) <= 50 else 'markers',
+            name='Teams',
+            marker=dict(
+                size=team_players * 2 + 15,
+                color=colors_team,
+                opacity=0.7,
+                line=dict(width=2, color=CFG_COLORS['border'])
+            ),
+            text=team_stats['Team'],
+            textposition='top center',
+            textfont=dict(size=9, color=CFG_COLORS['text']),
+            hovertemplate='<b>%{text}</b><br>Performance: %{x:.2f}<br>High Potential Players: %{y}<br>Total Players: %{customdata}<extra></extra>',
+            customdata=team_players
         ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=600
+        layout=dict(
+            title=dict(
+                text="<b>TEAM ANALYSIS: PERFORMANCE vs HIGH POTENTIAL PLAYERS</b>",
+                x=0.5,
+                font=dict(size=18, color=CFG_COLORS['secondary'])
+            ),
+            xaxis=dict(
+                title=dict(text="Average Performance Grade", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE
+            ),
+            yaxis=dict(
+                title=dict(text="Number of High Potential Players (Grade A)", font=dict(color=CFG_COLORS['text'], size=12)),
+                tickfont=dict(color=CFG_COLORS['text'], size=11),
+                **AXIS_STYLE
+            ),
+            **BASE_LAYOUT,
+            height=600
+        )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True, key='chart_team_scatter')
     
     st.success("""
     **STRATEGIC INSIGHT:** The team scatter analysis identifies the "elite talent factories" - clubs that combine proven current quality with 
@@ -1898,77 +2072,79 @@ def plot_team_scatter(df: pd.DataFrame, top_n: int = 20):
 
 
 def plot_trend_analysis(df: pd.DataFrame):
-    """Plot temporal trends in scouting activity - compact side by side."""
+    """Plot temporal trends in scouting activity - one figure, side by side subplots."""
     if 'MatchDate' not in df.columns or df['MatchDate'].isna().all():
         st.warning("Date data not available for temporal analysis.")
-        return None, None
-    
-    df_with_date = df[df['MatchDate'].notna()].copy()
-    df_with_date['Month'] = df_with_date['MatchDate'].dt.to_period('M')
-    
-    monthly_stats = df_with_date.groupby('Month').agg({
-        'PerformanceGrade': 'mean',
-        'PlayerID': 'nunique',
-        'ReportID': 'count'
-    }).reset_index()
-    monthly_stats['Month'] = monthly_stats['Month'].astype(str)
-    
-    # Performance trend - line chart
-    fig_perf = go.Figure()
-    fig_perf.add_trace(go.Scatter(
-        x=monthly_stats['Month'],
-        y=monthly_stats['PerformanceGrade'],
-        mode='lines+markers',
-        name='Performance',
-        line=dict(color=CFG_COLORS['primary'], width=3),
-        marker=dict(size=8, color=CFG_COLORS['primary']),
-        hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<extra></extra>'
-    ))
+        return None
+    
+    return build_trend_figure(build_monthly_stats(df))
+
+
+# Layout pieces for the monthly trend subplots, built once at import
+# (Plotly copies them into each figure, so sharing the dicts is safe)
+TREND_SUBPLOT_TITLE_FONT = dict(size=14, color=CFG_COLORS['secondary'])
+TREND_AXIS_TITLE_FONT = dict(color=CFG_COLORS['text'], size=11)
+TREND_MONTH_AXIS = dict(title=dict(text="Month", font=TREND_AXIS_TITLE_FONT),
+                        tickangle=45, tickfont=dict(color=CFG_COLORS['text'], size=10))
+TREND_VALUE_AXIS = dict(**AXIS_STYLE, tickfont=dict(color=CFG_COLORS['text'], size=10))
+TREND_LAYOUT = dict(
+    **BASE_LAYOUT,
+    height=450,
+    margin=dict(l=50, r=30, t=80, b=60),
+    showlegend=False
+)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_trend_figure(monthly_stats: MonthlyStats) -> go.Figure:
+    """Performance and activity trends side by side in one figure.
+
+    Built once per distinct set of monthly aggregates and shared across reruns; the figure
+    is never modified after construction, so st.plotly_chart only serializes it.
+    """
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('<b>AVERAGE PERFORMANCE OVER TIME</b>', '<b>SCOUTING ACTIVITY OVER TIME</b>'),
+        horizontal_spacing=0.08
+    )
     
-    fig_perf.update_layout(
-        title=dict(text="<b>AVERAGE PERFORMANCE OVER TIME</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        xaxis=dict(title=dict(text="Month", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  tickangle=45, tickfont=dict(color=CFG_COLORS['text'], size=10)),
-        yaxis=dict(title=dict(text="Performance Grade", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  gridcolor=CFG_COLORS['grid'], tickfont=dict(color=CFG_COLORS['text'], size=10),
-                  showgrid=True, zeroline=True, zerolinecolor=CFG_COLORS['border']),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=60),
-        showlegend=False
+    # Performance trend - line chart (WebGL once the month count gets long)
+    line_trace = go.Scattergl if len(monthly_stats.month) > 200 else go.Scatter
+    fig.add_trace(
+        line_trace(
+            x=monthly_stats.month,
+            y=monthly_stats.performance,
+            mode='lines+markers',
+            name='Performance',
+            line=dict(color=CFG_COLORS['primary'], width=3),
+            marker=dict(size=8, color=CFG_COLORS['primary']),
+            hovertemplate='<b>%{x}</b><br>Performance: %{y:.2f}<extra></extra>'
+        ),
+        row=1, col=1
     )
     
     # Activity trend - bar chart
-    fig_activity = go.Figure()
-    fig_activity.add_trace(go.Bar(
-        x=monthly_stats['Month'],
-        y=monthly_stats['ReportID'],
-        name='Reports',
-        marker_color=CFG_COLORS['success'],
-        text=monthly_stats['ReportID'],
-        textposition='outside',
-        textfont=dict(size=10, color=CFG_COLORS['text']),
-        hovertemplate='<b>%{x}</b><br>Reports: %{y}<extra></extra>'
-    ))
+    fig.add_trace(
+        go.Bar(
+            x=monthly_stats.month,
+            y=monthly_stats.reports,
+            name='Reports',
+            marker_color=CFG_COLORS['success'],
+            hovertemplate='<b>%{x}</b><br>Reports: %{y}<extra></extra>'
+        ),
+        row=1, col=2
+    )
     
-    fig_activity.update_layout(
-        title=dict(text="<b>SCOUTING ACTIVITY OVER TIME</b>", x=0.5, font=dict(size=14, color=CFG_COLORS['secondary'])),
-        xaxis=dict(title=dict(text="Month", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  tickangle=45, tickfont=dict(color=CFG_COLORS['text'], size=10)),
-        yaxis=dict(title=dict(text="Number of Reports", font=dict(color=CFG_COLORS['text'], size=11)), 
-                  gridcolor=CFG_COLORS['grid'], tickfont=dict(color=CFG_COLORS['text'], size=10),
-                  showgrid=True, zeroline=True, zerolinecolor=CFG_COLORS['border']),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=CFG_COLORS['text'], size=12),
-        height=450,
-        margin=dict(l=50, r=30, t=80, b=60),
-        showlegend=False
+    fig.update_annotations(font=TREND_SUBPLOT_TITLE_FONT)
+    fig.update_layout(
+        xaxis=TREND_MONTH_AXIS,
+        xaxis2=TREND_MONTH_AXIS,
+        yaxis=dict(title=dict(text="Performance Grade", font=TREND_AXIS_TITLE_FONT), **TREND_VALUE_AXIS),
+        yaxis2=dict(title=dict(text="Number of Reports", font=TREND_AXIS_TITLE_FONT), **TREND_VALUE_AXIS),
+        **TREND_LAYOUT
     )
     
-    return fig_perf, fig_activity
+    return fig
 
 
 # ===========================================
@@ -1993,21 +2169,32 @@ def display_header():
 # ===========================================
 # LOGIN PAGE
 # ===========================================
-def login_page():
-    """Display login page with City Football Group background."""
-    # Background image CSS - Using City Football Group colors with football field image
-    # Note: Behance URL is a page, not a direct image, so using football field image with CFG color overlay
-    st.markdown(f"""
-    <style>
+# Pitch graphic behind the login and homepage gradient overlay: a ~1 KB SVG shipped with
+# the app and inlined as a data URI, so first paint does not wait on an external photo
+PITCH_BACKGROUND_URI = 'data:image/svg+xml;base64,' + base64.b64encode(
+    (Path(__file__).parent / 'assets' / 'pitch_background.svg').read_bytes()
+).decode('ascii')
+
+# Full-page background rule shared by the login page and homepage stylesheets:
+# City Football Group colour gradient over the pitch graphic
+PAGE_BACKGROUND_CSS = f"""
         .stApp {{
             background: linear-gradient(rgba(30, 58, 95, 0.90), rgba(92, 171, 232, 0.90)), 
-                        url('https://images.unsplash.com/photo-1574629810360-7efbbe195018?w=1920&q=80');
+                        url('{PITCH_BACKGROUND_URI}');
+            background-color: {CFG_COLORS['secondary']};
             background-size: cover;
             background-position: center;
             background-repeat: no-repeat;
             background-attachment: fixed;
         }}
-        .login-container {{
+"""
+
+
+@st.cache_resource
+def login_css() -> str:
+    """Build the login page stylesheet once per server process."""
+    return f"""
+    <style>{PAGE_BACKGROUND_CSS}        .login-container {{
             background-color: rgba(255, 255, 255, 0.95);
             padding: 3rem;
             border-radius: 10px;
@@ -2030,7 +2217,13 @@ def login_page():
             margin-bottom: 2rem;
         }}
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def login_page():
+    """Display login page with City Football Group background."""
+    # Background image CSS - Using City Football Group colors over the bundled football pitch graphic
+    st.markdown(login_css(), unsafe_allow_html=True)
     
     # Login form
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -2050,7 +2243,11 @@ def login_page():
             submit_button = st.form_submit_button("**Login**", use_container_width=True)
             
             if submit_button:
-                if username == VALID_USERNAME and password == VALID_PASSWORD:
+                # Constant-time comparisons, both always evaluated (& rather than and); bytes
+                # so non-ASCII input compares instead of raising
+                credentials_ok = (hmac.compare_digest(username.encode(), VALID_USERNAME.encode())
+                                  & hmac.compare_digest(password.encode(), VALID_PASSWORD.encode()))
+                if credentials_ok:
                     st.session_state['authenticated'] = True
                     st.session_state['current_page'] = 'home'
                     st.rerun()
@@ -2061,64 +2258,49 @@ def login_page():
 # ===========================================
 # HOMEPAGE
 # ===========================================
-def homepage():
-    """Display homepage with navigation to tabs."""
-    # Background image CSS for homepage
-    st.markdown(f"""
-    <style>
-        .stApp {{
-            background: linear-gradient(rgba(30, 58, 95, 0.90), rgba(92, 171, 232, 0.90)), 
-                        url('https://images.unsplash.com/photo-1574629810360-7efbbe195018?w=1920&q=80');
-            background-size: cover;
-            background-position: center;
-            background-repeat: no-repeat;
-            background-attachment: fixed;
-        }}
-        .homepage-content {{
+# Homepage navigation entries, in grid order (left column first)
+HOMEPAGE_TABS = [
+    {
+        'name': 'Player Analysis',
+        'description': 'Top performers, high potential players, and comprehensive player comparisons',
+        'tab_id': 'player_analysis'
+    },
+    {
+        'name': 'Performance & Distribution',
+        'description': 'Performance distributions, age band analysis, and temporal trends',
+        'tab_id': 'performance_distribution'
+    },
+    {
+        'name': 'Geographic & Teams',
+        'description': 'Country performance analysis, team evaluations, and geographic talent mapping',
+        'tab_id': 'geographic_teams'
+    },
+    {
+        'name': 'Position & Scouts',
+        'description': 'Position analysis, preferred foot evaluation, and scout performance metrics',
+        'tab_id': 'position_scouts'
+    }
+]
+
+
+@st.cache_resource
+def homepage_css() -> str:
+    """Build the homepage background stylesheet once per server process."""
+    return f"""
+    <style>{PAGE_BACKGROUND_CSS}        .homepage-content {{
             background-color: rgba(255, 255, 255, 0.98);
             padding: 2rem;
             border-radius: 10px;
             margin: 1rem 0;
         }}
     </style>
-    """, unsafe_allow_html=True)
-    
-    display_header()
-    
-    st.markdown("### **DASHBOARD NAVIGATION**")
-    st.caption("Select an analysis section to explore")
-    
-    # Create navigation cards
-    tabs_info = [
-        {
-            'name': 'Player Analysis',
-            'description': 'Top performers, high potential players, and comprehensive player comparisons',
-            'tab_id': 'player_analysis'
-        },
-        {
-            'name': 'Performance & Distribution',
-            'description': 'Performance distributions, age band analysis, and temporal trends',
-            'tab_id': 'performance_distribution'
-        },
-        {
-            'name': 'Geographic & Teams',
-            'description': 'Country performance analysis, team evaluations, and geographic talent mapping',
-            'tab_id': 'geographic_teams'
-        },
-        {
-            'name': 'Position & Scouts',
-            'description': 'Position analysis, preferred foot evaluation, and scout performance metrics',
-            'tab_id': 'position_scouts'
-        }
-    ]
-    
-    # Display navigation cards in 2x2 grid
-    col1, col2 = st.columns(2)
-    
-    for idx, tab_info in enumerate(tabs_info):
-        with col1 if idx % 2 == 0 else col2:
-            # Create styled card with button
-            st.markdown(f"""
+    """
+
+
+@st.cache_resource
+def homepage_card_html() -> list:
+    """Format the navigation card markup for every HOMEPAGE_TABS entry once per server process."""
+    return [f"""
             <div style='
                 background-color: {CFG_COLORS['light_gray']};
                 border: 2px solid {CFG_COLORS['border']};
@@ -2129,20 +2311,39 @@ def homepage():
                 <h4 style='color: {CFG_COLORS['secondary']}; margin-bottom: 0.5rem;'>{tab_info['name']}</h4>
                 <p style='color: {CFG_COLORS['text_secondary']}; font-size: 0.9rem; margin: 0.5rem 0 1rem 0;'>{tab_info['description']}</p>
             </div>
-            """, unsafe_allow_html=True)
+            """ for tab_info in HOMEPAGE_TABS]
+
+
+def homepage():
+    """Display homepage with navigation to tabs."""
+    # Background image CSS for homepage
+    st.markdown(homepage_css(), unsafe_allow_html=True)
+    
+    display_header()
+    
+    st.markdown("### **DASHBOARD NAVIGATION**")
+    st.caption("Select an analysis section to explore")
+    
+    # Display navigation cards in 2x2 grid
+    col1, col2 = st.columns(2)
+    
+    for idx, (tab_info, card_html) in enumerate(zip(HOMEPAGE_TABS, homepage_card_html())):
+        with col1 if idx % 2 == 0 else col2:
+            # Styled card with button
+            st.markdown(card_html, unsafe_allow_html=True)
             
             # Navigation button
-            if st.button(f"**Access {tab_info['name']}**", key=f"nav_{tab_info['tab_id']}", use_container_width=True):
-                navigate_to_tab(tab_info['tab_id'])
+            st.button(f"**Access {tab_info['name']}**", key=f"nav_{tab_info['tab_id']}", use_container_width=True,
+                      on_click=navigate_to_tab, args=(tab_info['tab_id'],))
 
 
 # ===========================================
 # DASHBOARD PAGE
 # ===========================================
-def dashboard_page():
-    """Display main dashboard with tabs."""
-    # UI theming for sidebar and tabs
-    st.markdown(f"""
+@st.cache_resource
+def dashboard_css() -> str:
+    """Build the dashboard sidebar and tab button stylesheet once per server process."""
+    return f"""
     <style>
     /* Sidebar styling */
     [data-testid="stSidebar"] > div:first-child {{
@@ -2164,16 +2365,45 @@ def dashboard_page():
         background: white !important;
         color: {CFG_COLORS['primary']} !important;
     }}
+    /* Style Streamlit buttons to look like tabs */
+    div[data-testid="column"]:has(button[key*="tab_btn_"]) {{
+        padding: 0 !important;
+    }}
+    button[key*="tab_btn_"] {{
+        font-size: 1rem !important;
+        font-weight: 700 !important;
+        padding: 0.75rem 1rem !important;
+        border: 2px solid {CFG_COLORS['primary']} !important;
+        border-bottom: 3px solid {CFG_COLORS['primary']} !important;
+        border-radius: 8px 8px 0 0 !important;
+        background: {CFG_COLORS['primary']} !important;
+        color: white !important;
+        transition: all 0.2s !important;
+        height: 48px !important;
+        vertical-align: middle !important;
+        opacity: 0.8 !important;
+    }}
+    button[key*="tab_btn_"]:hover {{
+        background: {CFG_COLORS['secondary']} !important;
+        opacity: 1 !important;
+        border-color: {CFG_COLORS['secondary']} !important;
+    }}
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def dashboard_page():
+    """Display main dashboard with tabs."""
+    # UI theming for sidebar and tab buttons
+    st.markdown(dashboard_css(), unsafe_allow_html=True)
     
     display_header()
     
     # Load data
-    df_merged, df_players = load_data()
+    df_merged, df_players, filter_options = load_data()
     
     # Create filters
-    df_filtered, top_n = create_filters_sidebar(df_merged)
+    df_filtered, top_n = create_filters_sidebar(df_merged, filter_options)
     
     # Display KPIs
     st.markdown("### **KEY PERFORMANCE INDICATORS**")
@@ -2199,35 +2429,6 @@ def dashboard_page():
         {'id': 'position_scouts', 'label': 'Position & Scouts'}
     ]
     
-    # Create custom tab buttons styled like Streamlit tabs
-    st.markdown(f"""
-    <style>
-    /* Style Streamlit buttons to look like tabs */
-    div[data-testid="column"]:has(button[key*="tab_btn_"]) {{
-        padding: 0 !important;
-    }}
-    button[key*="tab_btn_"] {{
-        font-size: 1rem !important;
-        font-weight: 700 !important;
-        padding: 0.75rem 1rem !important;
-        border: 2px solid {CFG_COLORS['primary']} !important;
-        border-bottom: 3px solid {CFG_COLORS['primary']} !important;
-        border-radius: 8px 8px 0 0 !important;
-        background: {CFG_COLORS['primary']} !important;
-        color: white !important;
-        transition: all 0.2s !important;
-        height: 48px !important;
-        vertical-align: middle !important;
-        opacity: 0.8 !important;
-    }}
-    button[key*="tab_btn_"]:hover {{
-        background: {CFG_COLORS['secondary']} !important;
-        opacity: 1 !important;
-        border-color: {CFG_COLORS['secondary']} !important;
-    }}
-    </style>
-    """, unsafe_allow_html=True)
-    
     # Tab buttons row with Home button
     tab_cols = st.columns([4, 1])
     with tab_cols[0]:
@@ -2248,18 +2449,71 @@ def dashboard_page():
                     }}
                     </style>
                     """, unsafe_allow_html=True)
-                if st.button(tab_info['label'], key=f"tab_btn_{tab_info['id']}", use_container_width=True):
-                    st.session_state['selected_tab'] = tab_info['id']
-                    st.query_params.update(page='dashboard', tab=tab_info['id'])
-                    st.rerun()
+                st.button(tab_info['label'], key=f"tab_btn_{tab_info['id']}", use_container_width=True,
+                          on_click=navigate_to_tab, args=(tab_info['id'],))
     
     with tab_cols[1]:
-        if st.button("Home", key="home_tab_button"):
-            st.session_state['current_page'] = 'home'
-            st.query_params.clear()
-            st.rerun()
+        st.button("Home", key="home_tab_button", on_click=go_home)
     
     # Render content based on selected_tab_id (no Streamlit tabs, just conditional rendering)
+    render_tab_content(selected_tab_id, df_filtered)
+
+
+@st.fragment
+def render_player_comparison(df_filtered: pd.DataFrame, player_options: list, player_name_to_id: dict):
+    """Comparator player picker and chart; a fragment, so changing the picks reruns only this section."""
+    # One multiselect capped at three players (a player can't be picked twice)
+    picked_names = st.multiselect("**Players to Compare (2-3)**", player_options, max_selections=3,
+                                  placeholder="Select players...", key='comp_players')
+    selected_players = [player_name_to_id[name] for name in picked_names]
+    
+    if len(selected_players) >= 2:
+        plot_player_comparison(df_filtered, selected_players)
+
+
+@st.fragment
+def render_player_trend(df_filtered: pd.DataFrame, player_options: list, player_name_to_id: dict):
+    """Trend player picker and chart; a fragment, so picking a player reruns only this section."""
+    trend_player = st.selectbox("**Select Player for Trend Analysis**", ['Select...'] + player_options, key='trend_player')
+    if trend_player != 'Select...':
+        trend_player_id = player_name_to_id[trend_player]
+        plot_player_trend(df_filtered, trend_player_id)
+
+
+@st.fragment
+def render_age_band_potential(df_filtered: pd.DataFrame):
+    """Potential-by-age chart with its grade picker; a fragment, so changing the grade reruns only this chart."""
+    # Use default 'A' for initial render
+    fig_age_pot = plot_age_band_potential(df_filtered, 'A')
+    st.plotly_chart(fig_age_pot, use_container_width=True, key='chart_age_band_potential')
+    # Filter below chart, before conclusion
+    pot_grades_chart = ['A', 'B', 'C', 'D', 'E', 'F']
+    selected_pot_chart = st.selectbox("**Potential Grade**", pot_grades_chart, key='pot_filter_chart', index=0)
+    # Re-render if changed
+    if selected_pot_chart != 'A':
+        fig_age_pot = plot_age_band_potential(df_filtered, selected_pot_chart)
+        st.plotly_chart(fig_age_pot, use_container_width=True, key='chart_age_band_potential_selected')
+    st.markdown(f"""
+    <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
+    <strong>Strategic Insight:</strong> Potential Grade {selected_pot_chart} concentration by age band identifies the optimal development 
+    windows for future talent acquisition. High concentration in younger bands (U18-U21) is expected, but finding Grade {selected_pot_chart} 
+    players in older bands (25+) represents exceptional late-bloomer opportunities with lower market competition.<br>
+    <strong>Action Plan:</strong> 1) For U18-U21 with high {selected_pot_chart}%: Establish development partnerships or pre-contract agreements, 
+    2) For U21-U25 with {selected_pot_chart} potential: Target for controlled development pathways (loans with buy-options), 3) For 25+ with 
+    {selected_pot_chart} potential: Immediate value opportunity - assess for squad depth or resale value, 4) Allocate 60% of scouting resources 
+    to age bands showing >20% {selected_pot_chart} concentration, 5) Create age-specific development roadmaps for each {selected_pot_chart} 
+    player cohort.
+    </div>
+    """, unsafe_allow_html=True)
+
+
+@st.fragment
+def render_tab_content(selected_tab_id: str, df_filtered: pd.DataFrame):
+    """Render the selected dashboard tab.
+    
+    Runs as a fragment, so the widgets inside a tab only rerun this function
+    instead of reloading data, rebuilding the sidebar and recomputing KPIs.
+    """
     
     # ===========================================
     # TAB 1: PLAYER ANALYSIS
@@ -2284,7 +2538,7 @@ def dashboard_page():
             st.caption("Best average performance in the scouting pool")
             render_performance_color_legend()
             fig_top, player_stats = plot_top_players_ranking(df_filtered, top_n_chart)
-            st.plotly_chart(fig_top, use_container_width=True)
+            st.plotly_chart(fig_top, use_container_width=True, key='chart_top_players')
             st.markdown("""
             <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
             <strong>Strategic Insight:</strong> These players demonstrate elite-level consistency across multiple match evaluations, indicating 
@@ -2301,7 +2555,7 @@ def dashboard_page():
             st.caption(f"Players with potential grade {pot_filter}")
             render_performance_color_legend()
             fig_pot, high_pot_stats = plot_high_potential_players(df_filtered, top_n_chart, pot_filter)
-            st.plotly_chart(fig_pot, use_container_width=True)
+            st.plotly_chart(fig_pot, use_container_width=True, key='chart_high_potential')
             st.markdown(f"""
             <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
             <strong>Strategic Insight:</strong> Potential Grade {pot_filter} players represent the future value proposition of our scouting portfolio. 
@@ -2320,34 +2574,27 @@ def dashboard_page():
         st.markdown("### **COMPREHENSIVE PLAYER ANALYSIS TABLE**")
         st.caption("Detailed information for technical staff decision-making")
         
-        # Merge both datasets for unified table
-        player_stats['Type'] = 'Top Performer'
-        high_pot_stats['Type'] = f'High Potential ({pot_filter})'
+        # Merge both datasets for unified table: players already listed as top performers
+        # keep that label, so only the other high potential players are appended
+        table_columns = ['PlayerName', 'Country', 'Position', 'AvgPerformance', 'Potential', 'ReportCount']
+        high_pot_only = high_pot_stats[~high_pot_stats['PlayerName'].isin(player_stats['PlayerName'])]
         
-        # Prepare unified table with relevant columns for staff
+        # Prepare unified table with relevant columns for staff (one row per player name)
         unified_table = pd.concat([
-            player_stats[['PlayerName', 'Country', 'Position', 'AvgPerformance', 'Potential', 'ReportCount', 'Type']].rename(columns={
-                'PlayerName': 'Player',
-                'AvgPerformance': 'Avg Performance',
-                'ReportCount': 'Reports'
-            }),
-            high_pot_stats[['PlayerName', 'Country', 'Position', 'AvgPerformance', 'Potential', 'ReportCount', 'Type']].rename(columns={
-                'PlayerName': 'Player',
-                'AvgPerformance': 'Avg Performance',
-                'ReportCount': 'Reports'
-            })
-        ], ignore_index=True)
-        
-        # Remove duplicates (players that appear in both)
-        unified_table = unified_table.drop_duplicates(subset=['Player'], keep='first')
+            player_stats[table_columns].drop_duplicates(subset=['PlayerName']).assign(Type='Top Performer'),
+            high_pot_only[table_columns].drop_duplicates(subset=['PlayerName']).assign(Type=f'High Potential ({pot_filter})')
+        ], ignore_index=True).rename(columns={
+            'PlayerName': 'Player',
+            'AvgPerformance': 'Avg Performance',
+            'ReportCount': 'Reports'
+        })
         
-        # Add additional useful columns
-        for idx, row in unified_table.iterrows():
-            player_df = df_filtered[df_filtered['PlayerName'] == row['Player']]
-            if len(player_df) > 0:
-                unified_table.at[idx, 'Current Team'] = player_df['CurrentTeam'].mode()[0] if len(player_df['CurrentTeam'].mode()) > 0 else 'N/A'
-                unified_table.at[idx, 'Age Band'] = player_df['AgeBand'].mode()[0] if len(player_df['AgeBand'].mode()) > 0 else 'N/A'
-                unified_table.at[idx, 'Preferred Foot'] = player_df['ReportFoot'].mode()[0] if len(player_df['ReportFoot'].mode()) > 0 else 'N/A'
+        # Add additional useful columns: one group_mode pass per column over the listed
+        # players' rows (ties -> smallest value, like .mode()[0]) instead of a loop per player
+        table_rows = df_filtered[df_filtered['PlayerName'].isin(unified_table['Player'])]
+        for col, source in [('Current Team', 'CurrentTeam'), ('Age Band', 'AgeBand'), ('Preferred Foot', 'ReportFoot')]:
+            player_modes = group_mode(table_rows, ['PlayerName'], source)
+            unified_table[col] = player_modes.reindex(unified_table['Player']).fillna('N/A').to_numpy()
         
         # Reorder columns for better readability
         unified_table = unified_table[['Player', 'Type', 'Country', 'Position', 'Current Team', 'Age Band', 'Preferred Foot', 
@@ -2373,31 +2620,14 @@ def dashboard_page():
         st.caption("Compare 2-3 players side by side to identify best value")
         
         # Get list of players for selection (without IDs)
-        available_players = df_filtered.groupby(['PlayerID', 'PlayerName']).agg({
-            'PerformanceGrade': 'mean'
-        }).reset_index()
-        available_players = available_players.sort_values('PerformanceGrade', ascending=False)
+        available_players = df_filtered.groupby(['PlayerID', 'PlayerName'])['PerformanceGrade'].mean().reset_index()
+        # Only the top 50 players are offered, so partial-sort instead of ranking everyone
+        available_players = available_players.nlargest(50, 'PerformanceGrade')
         # Create mapping: player name -> player ID
-        player_name_to_id = {row['PlayerName']: row['PlayerID'] for _, row in available_players.iterrows()}
+        player_name_to_id = dict(zip(available_players['PlayerName'], available_players['PlayerID']))
         player_options = available_players['PlayerName'].tolist()
         
-        col_sel1, col_sel2, col_sel3 = st.columns(3)
-        selected_players = []
-        with col_sel1:
-            p1 = st.selectbox("**Player 1**", ['Select...'] + player_options[:50], key='comp_p1')
-            if p1 != 'Select...':
-                selected_players.append(player_name_to_id[p1])
-        with col_sel2:
-            p2 = st.selectbox("**Player 2**", ['Select...'] + player_options[:50], key='comp_p2')
-            if p2 != 'Select...':
-                selected_players.append(player_name_to_id[p2])
-        with col_sel3:
-            p3 = st.selectbox("**Player 3 (Optional)**", ['Select...'] + player_options[:50], key='comp_p3')
-            if p3 != 'Select...':
-                selected_players.append(player_name_to_id[p3])
-        
-        if len(selected_players) >= 2:
-            plot_player_comparison(df_filtered, selected_players)
+        render_player_comparison(df_filtered, player_options, player_name_to_id)
         
         st.markdown("---")
         
@@ -2406,10 +2636,7 @@ def dashboard_page():
         st.caption("Track individual player performance evolution over time")
         
         # Reuse player options from comparator (without IDs)
-        trend_player = st.selectbox("**Select Player for Trend Analysis**", ['Select...'] + player_options[:50], key='trend_player')
-        if trend_player != 'Select...':
-            trend_player_id = player_name_to_id[trend_player]
-            plot_player_trend(df_filtered, trend_player_id)
+        render_player_trend(df_filtered, player_options, player_name_to_id)
     
     # ===========================================
     # TAB 2: PERFORMANCE & DISTRIBUTION
@@ -2423,7 +2650,7 @@ def dashboard_page():
             st.caption("Distribution of performance grades")
             # Note: This chart uses colorscale with colorbar, no performance legend needed
             fig_dist = plot_performance_distribution(df_filtered)
-            st.plotly_chart(fig_dist, use_container_width=True)
+            st.plotly_chart(fig_dist, use_container_width=True, key='chart_performance_distribution')
             st.markdown("""
             <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
             <strong>Strategic Insight:</strong> This distribution reflects the quality calibration of our scouting network. A right-skewed distribution 
@@ -2441,7 +2668,7 @@ def dashboard_page():
             st.caption("Average performance by age groups")
             render_performance_color_legend()
             fig_age_perf = plot_age_band_performance(df_filtered)
-            st.plotly_chart(fig_age_perf, use_container_width=True)
+            st.plotly_chart(fig_age_perf, use_container_width=True, key='chart_age_band_performance')
             st.markdown("""
             <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
             <strong>Strategic Insight:</strong> Age band performance analysis reveals the optimal recruitment windows for different player profiles. 
@@ -2458,28 +2685,7 @@ def dashboard_page():
             st.markdown("#### **POTENTIAL BY AGE BAND**")
             st.caption("% players with selected potential")
             render_performance_color_legend()
-            # Use default 'A' for initial render
-            fig_age_pot = plot_age_band_potential(df_filtered, 'A')
-            st.plotly_chart(fig_age_pot, use_container_width=True)
-            # Filter below chart, before conclusion
-            pot_grades_chart = ['A', 'B', 'C', 'D', 'E', 'F']
-            selected_pot_chart = st.selectbox("**Potential Grade**", pot_grades_chart, key='pot_filter_chart', index=0)
-            # Re-render if changed
-            if selected_pot_chart != 'A':
-                fig_age_pot = plot_age_band_potential(df_filtered, selected_pot_chart)
-                st.plotly_chart(fig_age_pot, use_container_width=True)
-            st.markdown(f"""
-            <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
-            <strong>Strategic Insight:</strong> Potential Grade {selected_pot_chart} concentration by age band identifies the optimal development 
-            windows for future talent acquisition. High concentration in younger bands (U18-U21) is expected, but finding Grade {selected_pot_chart} 
-            players in older bands (25+) represents exceptional late-bloomer opportunities with lower market competition.<br>
-            <strong>Action Plan:</strong> 1) For U18-U21 with high {selected_pot_chart}%: Establish development partnerships or pre-contract agreements, 
-            2) For U21-U25 with {selected_pot_chart} potential: Target for controlled development pathways (loans with buy-options), 3) For 25+ with 
-            {selected_pot_chart} potential: Immediate value opportunity - assess for squad depth or resale value, 4) Allocate 60% of scouting resources 
-            to age bands showing >20% {selected_pot_chart} concentration, 5) Create age-specific development roadmaps for each {selected_pot_chart} 
-            player cohort.
-            </div>
-            """, unsafe_allow_html=True)
+            render_age_band_potential(df_filtered)
         
         st.markdown("---")
         
@@ -2494,14 +2700,10 @@ def dashboard_page():
         st.markdown("### **TEMPORAL TRENDS ANALYSIS**")
         st.caption("Evolution of average scouting performance and activity over time")
         
-        col_trend1, col_trend2 = st.columns(2)
-        fig_perf_trend, fig_activity_trend = plot_trend_analysis(df_filtered)
+        fig_trends = plot_trend_analysis(df_filtered)
         
-        if fig_perf_trend is not None and fig_activity_trend is not None:
-            with col_trend1:
-                st.plotly_chart(fig_perf_trend, use_container_width=True)
-            with col_trend2:
-                st.plotly_chart(fig_activity_trend, use_container_width=True)
+        if fig_trends is not None:
+            st.plotly_chart(fig_trends, use_container_width=True, key='chart_trends')
             
             st.markdown("""
             <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
@@ -2536,7 +2738,7 @@ def dashboard_page():
             st.caption("Comparative analysis of performance by country")
             render_performance_color_legend()
             fig_country_perf = plot_country_performance(df_filtered, top_n_geo)
-            st.plotly_chart(fig_country_perf, use_container_width=True)
+            st.plotly_chart(fig_country_perf, use_container_width=True, key='chart_country_performance')
             st.markdown("""
             <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
             <strong>Strategic Insight:</strong> Geographic performance analysis identifies the world's premium talent markets where our scouting 
@@ -2562,7 +2764,7 @@ def dashboard_page():
             selected_pot_geo = st.selectbox("**Potential Grade**", pot_grades_geo, key='pot_filter_geo', index=0)
             # Render chart once with selected filter
             fig_country_pot = plot_country_potential(df_filtered, top_n_geo, selected_pot_geo)
-            st.plotly_chart(fig_country_pot, use_container_width=True)
+            st.plotly_chart(fig_country_pot, use_container_width=True, key='chart_country_potential')
             st.markdown(f"""
             <div style='font-size: 0.85rem; color: #6B7280; padding: 0.5rem; background-color: #F3F4F6; border-radius: 5px; margin-top: 0.5rem;'>
             <strong>Strategic Insight:</strong> Potential Grade {selected_pot_geo} concentration by country reveals markets with exceptional 
@@ -2582,39 +2784,26 @@ def dashboard_page():
         
         st.markdown("---")
         
-        # Row 2: Team Analysis (2 columns - simplified)
+        # Row 2: Team Analysis (2 columns - simplified); both charts rank the same team aggregate
+        team_stats = build_team_stats(df_filtered)
         col_team1, col_team2 = st.columns(2)
         
         with col_team1:
             st.markdown("### **TEAM PERFORMANCE ANALYSIS**")
             st.caption("Average performance by current team")
             render_performance_color_legend()
-            plot_team_performance_simple(df_filtered, top_n_geo)
+            plot_team_performance_simple(df_filtered, top_n_geo, team_stats)
         
         with col_team2:
             st.markdown("### **POTENTIAL DISTRIBUTION BY TEAM**")
             st.caption("Distribution of potential grades (A, B, C, D) by team")
-            plot_team_potential_distribution(df_filtered, top_n_geo)
+            plot_team_potential_distribution(df_filtered, top_n_geo, team_stats)
         
         st.markdown("---")
         
         # Country statistics table
         st.markdown("### **COUNTRY STATISTICS**")
-        country_list = df_filtered['Country'].unique()
-        country_stats_list = []
-        for country in country_list:
-            country_df = df_filtered[df_filtered['Country'] == country]
-            unique_players = country_df['PlayerID'].nunique()
-            players_with_a = country_df[country_df['PotentialGrade'] == 'A']['PlayerID'].nunique()
-            high_pot_pct = (players_with_a / unique_players * 100) if unique_players > 0 else 0
-            country_stats_list.append({
-                'Country': country,
-                'Avg Performance': round(country_df['PerformanceGrade'].mean(), 2),
-                'Scouted Players': unique_players,
-                '% High Potential': round(high_pot_pct, 2)
-            })
-        country_stats = pd.DataFrame(country_stats_list)
-        country_stats = country_stats.sort_values('Avg Performance', ascending=False)
+        country_stats = build_country_stats(df_filtered)
         
         col_table3, col_dl3 = st.columns([3, 1])
         with col_table3:
@@ -2635,14 +2824,14 @@ def dashboard_page():
             st.caption("Performance grade by tactical position")
             render_performance_color_legend()
             fig_pos_perf = plot_position_performance(df_filtered)
-            st.plotly_chart(fig_pos_perf, use_container_width=True)
+            st.plotly_chart(fig_pos_perf, use_container_width=True, key='chart_position_performance')
         
         with col_pos2:
             st.markdown("#### **SCOUTING COVERAGE BY POSITION**")
             st.caption("Number of unique players scouted by position")
             # Note: This chart shows coverage count, not performance, so legend not applicable
             fig_pos_cov = plot_position_coverage(df_filtered)
-            st.plotly_chart(fig_pos_cov, use_container_width=True)
+            st.plotly_chart(fig_pos_cov, use_container_width=True, key='chart_position_coverage')
         
         # Position Analysis conclusions
         st.markdown("""
@@ -2671,14 +2860,14 @@ def dashboard_page():
             st.caption("Performance grade by preferred foot")
             # Note: Pie chart has its own legend, no performance legend needed
             fig_foot_perf = plot_foot_performance(df_filtered)
-            st.plotly_chart(fig_foot_perf, use_container_width=True)
+            st.plotly_chart(fig_foot_perf, use_container_width=True, key='chart_foot_performance')
         
         with col_foot2:
             st.markdown("#### **PLAYER DISTRIBUTION BY FOOT**")
             st.caption("Number of unique players by preferred foot")
             # Note: This chart shows distribution count, not performance, so legend not applicable
             fig_foot_dist = plot_foot_distribution(df_filtered)
-            st.plotly_chart(fig_foot_dist, use_container_width=True)
+            st.plotly_chart(fig_foot_dist, use_container_width=True, key='chart_foot_distribution')
         
         # Foot Analysis conclusions
         st.markdown("""
@@ -2709,10 +2898,10 @@ def dashboard_page():
         
         # Row 4: Position Statistics Table (between Scout Analysis and Executive Summary)
         st.markdown("### **POSITION STATISTICS**")
-        position_list = df_filtered['ReportPrimaryPosition'].unique()
+        position_indices = df_filtered.groupby('ReportPrimaryPosition', observed=True, sort=False).indices
         position_stats_list = []
-        for position in position_list:
-            pos_df = df_filtered[df_filtered['ReportPrimaryPosition'] == position]
+        for position, rows in position_indices.items():
+            pos_df = df_filtered.take(rows)
             unique_players = pos_df['PlayerID'].nunique()
             players_with_a = pos_df[pos_df['PotentialGrade'] == 'A']['PlayerID'].nunique()
             high_pot_pct = (players_with_a / unique_players * 100) if unique_players > 0 else 0
@@ -2740,8 +2929,8 @@ def dashboard_page():
     
     with col1:
         st.markdown("#### **KEY FINDINGS**")
-        top_country = df_filtered.groupby('Country')['PerformanceGrade'].mean().idxmax()
-        top_position = df_filtered.groupby('ReportPrimaryPosition')['PerformanceGrade'].mean().idxmax()
+        top_country = df_filtered.groupby('Country', observed=True)['PerformanceGrade'].mean().idxmax()
+        top_position = df_filtered.groupby('ReportPrimaryPosition', observed=True)['PerformanceGrade'].mean().idxmax()
         high_pot_count = df_filtered[df_filtered['PotentialGrade'] == 'A']['PlayerID'].nunique()
         
         st.markdown(f"""